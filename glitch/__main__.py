@@ -1,107 +1,46 @@
 import json
-import tqdm
+import time
 import functools
+import multiprocessing
 import click, os, sys
 
 from pathlib import Path
-from typing import Tuple, List, Set, Optional, TextIO, Dict, Any
-from glitch.analysis.rules import Error, RuleVisitor
-from glitch.helpers import get_smell_types, get_smells, ini_to_json_dict
-from glitch.stats.print import print_stats
-from glitch.stats.stats import FileStats
+from typing import Tuple, List, Set, Optional, Dict, Any
+from glitch.analysis.rules import Error
+from glitch.helpers import (
+    get_smell_types,
+    get_smells,
+    ini_to_json_dict,
+    get_changed_files,
+)
+from glitch.stats.stats import FileStats, SmellStats
 from glitch.tech import Tech
 from glitch.repr.inter import UnitBlockType
-from glitch.parsers.parser import Parser
-from glitch.parsers.ansible import AnsibleParser
-from glitch.parsers.chef import ChefParser
-from glitch.parsers.puppet import PuppetParser
-from glitch.parsers.terraform import TerraformParser
-from glitch.parsers.gha import GithubActionsParser
 from glitch.exceptions import throw_exception
-from glitch.repair.interactive.main import run_infrafix
-from importlib.resources import files
-from copy import deepcopy
-from concurrent.futures import ThreadPoolExecutor, Future, as_completed
-from glitch.rego.engine import load_rego_from_path, run_analyses
+from glitch.cache import ResultsCache
+from glitch.parsers.parser import Parser
+from glitch.exclude import Excludes, IGNORE_FILE
+from glitch.writers import get_writer
+from glitch.runner import (
+    get_resource_path,
+    get_parser,
+    get_parse_executor,
+    filter_analysis,
+    parse_and_check,
+    init_worker,
+    parse_and_check_worker,
+)
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    Future,
+    as_completed,
+)
+from glitch.rego.engine import prepare_analyses, free_analyses, run_analyses_batch
 from glitch.rego.rego_python.src.rego_python import is_rego_available, get_rego_error
 
 
-# NOTE: These are necessary in order for python to load the visitors.
-# Otherwise, python will not consider these types of rules.
-from glitch.analysis.design.visitor import DesignVisitor  # type: ignore
-from glitch.analysis.security.visitor import SecurityVisitor  # type: ignore
-
-
-def __get_resource_path(resource: str) -> str:
-    return str(files("glitch").joinpath(resource))
-
-
-def __parse_and_check(
-    type: UnitBlockType,
-    path: str,
-    module: bool,
-    parser: Parser,
-    analyses: List[RuleVisitor],
-    stats: FileStats,
-    config_rego: Dict[str, Dict[str, List[str]]],
-    rego_modules: Dict[str, str],
-) -> Set[Error]:
-    errors: Set[Error] = set()
-    inter = parser.parse(path, type, module)
-    # Avoids problems with multiple threads (and possibly multiple files)
-    # sharing the same object
-
-    analyses = deepcopy(analyses)
-    if inter != None:
-        for analysis in analyses:
-            errors.update(analysis.check(inter))
-
-        inputRego = json.dumps(inter.as_dict(), indent=2)
-
-        errors.update(run_analyses(inputRego, config_rego, rego_modules))
-
-        stats.compute(inter)
-
-    return errors
-
-
-def __filter_analysis(
-    smell_types: Tuple[str, ...], config: str, tech: Tech
-) -> Tuple[Dict[str, str], List[RuleVisitor]]:
-    rego_modules: Dict[str, str] = {}
-    python_analyses: List[RuleVisitor] = []
-
-    rego_lib_path = __get_resource_path("rego/queries/library/glitch_lib.rego")
-    if not os.path.exists(rego_lib_path):
-        raise FileNotFoundError("The rego query library does not exist.")
-    load_rego_from_path(rego_lib_path, rego_modules)
-
-    for smell_type in smell_types:
-        smells: List[str] = get_smells([smell_type], tech)
-        fallback: Set[str] = set()
-
-        for smell in smells:
-            rego_path = __get_resource_path(f"rego/queries/{smell_type}/{smell}.rego")
-            if os.path.exists(rego_path):
-                load_rego_from_path(rego_path, rego_modules)
-            else:
-                fallback.add(smell)
-
-        if len(fallback) > 0:
-            match smell_type:
-                case "design":
-                    visitor = DesignVisitor(tech, fallback)
-                case "security":
-                    visitor = SecurityVisitor(tech, fallback)
-                case _:
-                    raise ValueError(f"Invalid smell type: {smell_type}")
-
-            visitor.config(config)
-            python_analyses.append(visitor)
-
-    return rego_modules, python_analyses
-
-
 def __get_tech(tech: str) -> Tech:
     for t in Tech:
         if t.tech == tech:
@@ -113,46 +52,18 @@ def __get_tech(tech: str) -> Tech:
     )
 
 
-def __print_errors(errors: Set[Error], f: TextIO, linter: bool, csv: bool) -> None:
-    errors_sorted = sorted(errors, key=lambda e: (e.path, e.line, e.code))
-    if linter:
-        for error in errors_sorted:
-            print(Error.ALL_ERRORS[error.code] + "," + error.to_csv(), file=f)
-    elif csv:
-        for error in errors_sorted:
-            print(error.to_csv(), file=f)
-    else:
-        for error in errors_sorted:
-            print(error, file=f)
-
-
-def __get_parser(tech: Tech) -> Parser:
-    if tech == Tech.ansible:
-        return AnsibleParser()
-    elif tech == Tech.chef:
-        return ChefParser()
-    elif tech == Tech.puppet:
-        return PuppetParser()
-    elif tech == Tech.terraform:
-        return TerraformParser()
-    elif tech == Tech.gha:
-        return GithubActionsParser()
-    else:
-        raise ValueError(f"Invalid tech: {tech}")
-
-
 def __get_paths_and_title(
-    folder_strategy: str, path: str, tech: Tech
+    folder_strategy: str, path: str, tech: Tech, excludes: Excludes = Excludes()
 ) -> Tuple[Set[str], str]:
     paths: Set[str] = set()
     title = ""
 
     if folder_strategy == "dataset":
-        paths = set([f.path for f in os.scandir(f"{path}") if f.is_dir()])
+        paths = set([f.path for f in excludes.scandir(f"{path}") if f.is_dir()])
         title = "ANALYZING SUBFOLDERS"
     elif folder_strategy == "include-all":
         extensions = tech.extensions
-        for root, _, files in os.walk(path):
+        for root, _, files in excludes.walk(path):
             for name in files:
                 name_split = name.split(".")
                 if (
@@ -171,6 +82,76 @@ def __get_paths_and_title(
     return paths, title
 
 
+def __filter_changed_paths(
+    paths: Set[str],
+    changed: Set[str],
+    tech: Tech,
+    parser: Parser,
+    root: str,
+    module: bool,
+) -> Tuple[Set[str], Set[str]]:
+    """Keeps what changed in the paths found in root: the modules (e.g.
+    Ansible roles, Puppet modules, Chef cookbooks or Terraform folders) that
+    contain a changed file of the technology, and the changed files that are
+    not in a module. With the module strategy, the paths are modules already.
+
+    Returns the paths kept and which of them are analyzed as modules."""
+    changed = set(c for c in changed if c.split(".")[-1] in tech.extensions)
+    res: Set[str] = set()
+    modules: Set[str] = set()
+    for p in paths:
+        real = os.path.realpath(p)
+        files: List[Tuple[str, Optional[str]]] = []
+        if os.path.isfile(p):
+            if real in changed:
+                files.append((p, root if os.path.isdir(root) else None))
+        else:
+            for c in changed:
+                if c.startswith(real + os.sep):
+                    file = os.path.join(p, os.path.relpath(c, real))
+                    if not parser.excludes.excluded_below(file, p):
+                        files.append((file, p))
+            if module and len(files) > 0:
+                res.add(p)
+                modules.add(p)
+                continue
+
+        for file, folder in files:
+            m = None if folder is None else parser.get_module(file, folder)
+            if m is None:
+                res.add(file)
+            else:
+                res.add(m)
+                modules.add(m)
+    return res, modules
+
+
+def __check_rego() -> None:
+    if not is_rego_available():
+        click.echo(
+            f"Error: Rego library is not available. {get_rego_error()}", err=True
+        )
+        click.echo(
+            "Please build or install the Rego library. See README for instructions.",
+            err=True,
+        )
+        sys.exit(1)
+
+
+def __get_config(config: str) -> str:
+    if config != "configs/default.ini" and not os.path.exists(config):
+        raise click.BadOptionUsage(
+            "config", f"Invalid value for 'config': Path '{config}' does not exist."
+        )
+    elif os.path.isdir(config):
+        raise click.BadOptionUsage(
+            "config", f"Invalid value for 'config': Path '{config}' should be a file."
+        )
+    elif config == "configs/default.ini":
+        config = get_resource_path("configs/default.ini")
+    return config
+
+
 def __common_params(func: Any) -> Any:
     @click.option(
         "--tech",
@@ -192,6 +173,32 @@ def __common_params(func: Any) -> Any:
     return wrapper
 
 
+def __exclude_params(func: Any) -> Any:
+    @click.option(
+        "--exclude",
+        type=str,
+        multiple=True,
+        metavar="GLOB",
+        help="A pattern of the files and folders to skip (e.g. 'vendor/' or '*.test.yml'). "
+        "Patterns without a slash match names at any depth, the others match paths "
+        "relative to PATH, and a trailing slash only matches folders. "
+        f"More patterns are read from the {IGNORE_FILE} file in PATH, one per line. "
+        "Excluded folders are never traversed.",
+    )
+    @click.option(
+        "--no-default-excludes",
+        is_flag=True,
+        default=False,
+        help="Also analyze the folders skipped by default for the technology "
+        "(e.g. .git, node_modules or .terraform).",
+    )
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
 @click.group()
 def cli():
     pass
@@ -240,6 +247,15 @@ def cli():
     default=False,
     help="Changes the output to CSV format.",
 )
+@click.option(
+    "--format",
+    type=click.Choice(["jsonl", "sarif"]),
+    default=None,
+    help="Changes the output to JSON Lines (one JSON object per smell) or to a SARIF log. "
+    "Both include the line and column where each smell starts and ends. "
+    "The summary tables are only printed if an OUTPUT file is given. "
+    "Cannot be used with --csv or --linter.",
+)
 @click.option(
     "--smell-types",
     type=click.Choice(get_smell_types(), case_sensitive=False),
@@ -249,9 +265,51 @@ def cli():
 @click.option(
     "--n-workers",
     type=int,
-    help="Number of parallel workers to use. Defaults to 1.",
+    help="Number of parallel workers to use. "
+    "With the project and module strategies, the modules and files of the path are parsed in parallel. "
+    "Defaults to 1.",
     default=1,
 )
+@click.option(
+    "--executor",
+    type=click.Choice(["thread", "process"]),
+    default="thread",
+    help="The kind of workers used to analyze the paths. "
+    "If 'thread', the workers are threads of the current process. "
+    "If 'process', each worker is a separate process that builds its own parser and analyses, "
+    "which avoids contention on the GIL when using several workers. "
+    "Defaults to 'thread'.",
+)
+@click.option(
+    "--rego-batch-size",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of paths whose Rego analyses are evaluated in a single call to the Rego engine. "
+    "If greater than 1, the workers only parse the paths and run the Python analyses, "
+    "and each batch is evaluated concurrently by the Rego engine. "
+    "Defaults to 1.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="A folder where the intermediate representation of the parsed scripts is cached. "
+    "Scripts whose content did not change since they were cached are not parsed again. "
+    "The errors found in each file are also cached and reused while the file, the config "
+    "and the analyses being run do not change.",
+)
+@click.option(
+    "--changed-since",
+    type=str,
+    metavar="GIT_REF",
+    default=None,
+    help="Only analyze what changed since the given git reference. "
+    "The modules (e.g. Ansible roles, Puppet modules, Chef cookbooks or Terraform folders) "
+    "that contain a file that changed (including uncommitted and untracked files) are analyzed "
+    "as modules, and the files that changed outside of them are analyzed individually. "
+    "PATH must be inside a git repository.",
+)
+@__exclude_params
 @click.argument("output", type=click.Path(), required=False)
 def lint(
     tech: str,  # type: ignore
@@ -260,40 +318,36 @@ def lint(
     folder_strategy: str,
     config: str,
     csv: bool,
+    format: Optional[str],
     smell_types: Tuple[str, ...],
     output: Optional[str],
     table_format: str,
     linter: bool,
     n_workers: int,
+    executor: str,
+    rego_batch_size: int,
+    cache_dir: Optional[str],
+    changed_since: Optional[str],
+    exclude: Tuple[str, ...],
+    no_default_excludes: bool,
 ):
+    import tqdm
+
     tech: Tech = __get_tech(tech)
     type = UnitBlockType(type)
     module = folder_strategy == "module"
-
-    if not is_rego_available():
-        click.echo(
-            f"Error: Rego library is not available. {get_rego_error()}", err=True
-        )
-        click.echo(
-            "Please build or install the Rego library. See README for instructions.",
-            err=True,
-        )
-        sys.exit(1)
-
-    if config != "configs/default.ini" and not os.path.exists(config):
+    if format is not None and (csv or linter):
         raise click.BadOptionUsage(
-            "config", f"Invalid value for 'config': Path '{config}' does not exist."
-        )
-    elif os.path.isdir(config):
-        raise click.BadOptionUsage(
-            "config", f"Invalid value for 'config': Path '{config}' should be a file."
+            "format", "--format cannot be used with --csv or --linter."
         )
-    elif config == "configs/default.ini":
-        config = __get_resource_path("configs/default.ini")
 
-    parser = __get_parser(tech)
+    __check_rego()
+    config = __get_config(config)
+
+    excludes = Excludes.load(path, tech, list(exclude), not no_default_excludes)
+    parser = get_parser(tech, cache_dir, excludes)
     if tech == Tech.terraform:
-        config = __get_resource_path("configs/terraform.ini")
+        config = get_resource_path("configs/terraform.ini")
     file_stats = FileStats()
 
     if smell_types == ():
@@ -301,47 +355,166 @@ def lint(
 
     config_rego = ini_to_json_dict(config)
 
-    rego_modules, analyses = __filter_analysis(smell_types, config, tech)
-
-    errors: List[Error] = []
+    # Only counters are kept for the summary, the errors of each path are
+    # written and released as soon as they are found
+    smell_stats = SmellStats(get_smells(smell_types, tech))
     paths: Set[str]
     title: str
-    paths, title = __get_paths_and_title(folder_strategy, path, tech)
-    futures: List[Future[Set[Error]]] = []
-    future_to_path: Dict[Future[Set[Error]], str] = {}
-    executor = ThreadPoolExecutor(max_workers=n_workers)
+    paths, title = __get_paths_and_title(folder_strategy, path, tech, excludes)
+    # The paths analyzed as modules
+    modules: Set[str] = set(paths) if module else set()
+    if changed_since is not None:
+        try:
+            changed = get_changed_files(path, changed_since)
+        except (ValueError, OSError) as e:
+            raise click.BadOptionUsage(
+                "changed_since", f"Invalid value for 'changed-since': {e}"
+            )
+        paths, modules = __filter_changed_paths(
+            paths, changed, tech, parser, path, module
+        )
+    future_to_path: Dict[Future[Any], str] = {}
+    future_to_stats: Dict[Future[Any], FileStats] = {}
+    pool: Executor
+    parse_pool: Optional[Executor] = None
+    if folder_strategy in ["project", "module"] and n_workers > 1:
+        # There is a single path, so the workers parse its modules and files
+        # instead, while this process assembles and analyzes it
+        parse_pool = get_parse_executor(parser, executor, n_workers)
+        executor = "thread"
+    rego_query: Optional[int] = None
+    defer_rego = rego_batch_size > 1
+    rego_modules, analyses = filter_analysis(smell_types, config, tech)
+    if defer_rego or executor == "thread":
+        # The Rego modules are compiled once and evaluated for every path
+        rego_query = prepare_analyses(config_rego, rego_modules)
 
-    for p in paths:
-        futures.append(
-            executor.submit(
-                __parse_and_check,
+    f = sys.stdout if output is None else open(output, "w")
+    writer = get_writer(f, format, linter, csv, get_smells(smell_types, tech))
+    writer.begin()
+
+    results_cache: Optional[ResultsCache] = None
+    # Cache entries for the files being analyzed, stored once they are done
+    entries: Dict[str, str] = {}
+
+    def report(path: str, new_errors: Set[Error], stats: FileStats) -> None:
+        smell_stats.add(new_errors)
+        file_stats.merge(stats)
+        writer.write(sorted(new_errors, key=lambda e: (e.path, e.line, e.code)))
+        if results_cache is not None and path in entries:
+            results_cache.store(entries.pop(path), new_errors, stats)
+
+    if cache_dir is not None:
+        results_cache = ResultsCache(
+            cache_dir,
+            tech,
+            config,
+            get_smells(smell_types, tech),
+            rego_modules,
+            analyses,
+        )
+        # Projects and modules are not cached since some of their
+        # analyses depend on several files
+        for p in [p for p in paths if p not in modules and os.path.isfile(p)]:
+            entry = results_cache.entry(p, type)
+            if entry is None:
+                continue
+            result = results_cache.load(entry)
+            if result is None:
+                entries[p] = entry
+            else:
+                records, stats = result
+                report(p, set(Error.from_record(r) for r in records), stats)
+                paths.remove(p)
+
+    if executor == "process":
+        # The Go runtime behind the Rego library is not fork-safe, so the
+        # workers are spawned and build their own parser and analyses
+        pool = ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(tech, smell_types, config, defer_rego, cache_dir, excludes),
+        )
+        for p in paths:
+            future = pool.submit(parse_and_check_worker, type, p, p in modules)
+            future_to_path[future] = p
+    else:
+        pool = ThreadPoolExecutor(max_workers=n_workers)
+        for p in paths:
+            stats = FileStats()
+            future = pool.submit(
+                parse_and_check,
                 type,
                 p,
-                module,
+                p in modules,
                 parser,
                 analyses,
-                file_stats,
-                config_rego,
-                rego_modules,
+                stats,
+                rego_query,
+                defer_rego,
             )
-        )
-        future_to_path[futures[-1]] = p
+            future_to_path[future] = p
+            future_to_stats[future] = stats
 
-    f = sys.stdout if output is None else open(output, "w")
-    if csv:
-        print("PATH,LINE,ERROR,DESCRIPTION,CODE", file=f)
-    for future in tqdm.tqdm(as_completed(futures), total=len(futures), desc=title):
+    # Paths waiting for their Rego analyses to be evaluated in a batch
+    batch: List[Tuple[str, Set[Error], FileStats, bytes]] = []
+
+    def evaluate_batch() -> None:
         try:
-            new_errors = future.result()
-            errors.extend(new_errors)
-            __print_errors(new_errors, f, linter, csv)
+            start = time.perf_counter()
+            batch_errors = run_analyses_batch([i for *_, i in batch], rego_query)
+            file_stats.analysis_time += time.perf_counter() - start
+            for (p, new_errors, stats, _), rego_errors in zip(batch, batch_errors):
+                report(p, new_errors | set(rego_errors), stats)
         except:
-            throw_exception("Unknown Error: {}", future_to_path[future])
+            throw_exception("Unknown Error: {}", ", ".join(p for p, *_ in batch))
+        batch.clear()
+
+    total = len(future_to_path)
+    for future in tqdm.tqdm(as_completed(future_to_path), total=total, desc=title):
+        # The finished futures are dropped, together with their results
+        p = future_to_path.pop(future)
+        try:
+            if executor == "process":
+                records, stats, rego_input = future.result()
+                new_errors = (
+                    None
+                    if records is None
+                    else set(Error.from_record(r) for r in records)
+                )
+            else:
+                new_errors, rego_input = future.result()
+                stats = future_to_stats.pop(future)
+
+            if new_errors is None:
+                # Paths that could not be parsed are not cached
+                entries.pop(p, None)
+                report(p, set(), stats)
+            elif rego_input is None:
+                report(p, new_errors, stats)
+            else:
+                batch.append((p, new_errors, stats, rego_input))
+        except:
+            throw_exception("Unknown Error: {}", p)
+
+        if len(batch) >= rego_batch_size:
+            evaluate_batch()
+    if len(batch) > 0:
+        evaluate_batch()
+    pool.shutdown()
+    if parse_pool is not None:
+        parse_pool.shutdown()
+    free_analyses(rego_query)
+    writer.end()
     if f != sys.stdout:
         f.close()
 
-    if not linter:
-        print_stats(errors, get_smells(smell_types, tech), file_stats, table_format)
+    # The tables would be mixed with the smells written to stdout
+    if not linter and (format is None or output is not None):
+        from glitch.stats.print import print_stats
+
+        print_stats(smell_stats, file_stats, table_format)
 
 
 @cli.command()
@@ -353,8 +526,10 @@ def infrafix(
     tech: str,  # type: ignore
     type: UnitBlockType,
 ):
+    from glitch.repair.interactive.main import run_infrafix
+
     tech: Tech = __get_tech(tech)
-    parser = __get_parser(tech)
+    parser = get_parser(tech)
     run_infrafix(path, pid, parser, type, tech)
 
 
@@ -366,19 +541,129 @@ def infrafix(
     default=False,
     help="True if the path is a module, false otherwise.",
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="A folder where the intermediate representation of the parsed scripts is cached. "
+    "Scripts whose content did not change since they were cached are not parsed again.",
+)
+@__exclude_params
 def repr(
     path: str,
     type: UnitBlockType,
     tech: str,  # type: ignore
     module: bool,
+    cache_dir: Optional[str],
+    exclude: Tuple[str, ...],
+    no_default_excludes: bool,
 ) -> None:
     tech: Tech = __get_tech(tech)
-    parser = __get_parser(tech)
+    excludes = Excludes.load(path, tech, list(exclude), not no_default_excludes)
+    parser = get_parser(tech, cache_dir, excludes)
     inter = parser.parse(path, type, module)
     if inter != None:
         print(json.dumps(inter.as_dict(), indent=2))
 
 
+@cli.command(
+    help="Start a server that keeps the parsers and analyses loaded and lints "
+    "single files on request, e.g. for code editors.\n"
+    "Requests and responses are JSON objects, one per line, read from stdin "
+    "and written to stdout, unless a Unix socket is given. "
+    'For example: {"id": 1, "method": "lint", "params": {"tech": "puppet", '
+    '"path": "site.pp"}}. The params may also include the "type" of the file '
+    'and its "content", which is linted instead of the file on disk.'
+)
+@click.option(
+    "--socket",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="The path of a Unix socket on which to listen for requests. "
+    "Defaults to stdin and stdout.",
+)
+@click.option(
+    "--config",
+    type=click.Path(),
+    default="configs/default.ini",
+    help="The path for a config file. Otherwise the default config is used.",
+)
+@click.option(
+    "--smell-types",
+    type=click.Choice(get_smell_types(), case_sensitive=False),
+    multiple=True,
+    help="The type of smell_types being analyzed.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="A folder where the intermediate representation of the parsed scripts is cached.",
+)
+def serve(
+    socket: Optional[str],
+    config: str,
+    smell_types: Tuple[str, ...],
+    cache_dir: Optional[str],
+) -> None:
+    from glitch.server import LintServer
+
+    __check_rego()
+    server = LintServer(__get_config(config), smell_types, cache_dir)
+    try:
+        if socket is None:
+            server.serve_stdio(sys.stdin, sys.stdout)
+        else:
+            server.serve_unix(socket)
+    finally:
+        server.close()
+
+
+@cli.command(
+    help="Start a Language Server Protocol server on stdin and stdout that "
+    "publishes the smells of the open documents as diagnostics."
+)
+@click.option(
+    "--tech",
+    type=click.Choice([t.tech for t in Tech]),
+    default=None,
+    help="The IaC technology of the documents. "
+    "Otherwise, it is inferred from the extension of each document.",
+)
+@click.option(
+    "--config",
+    type=click.Path(),
+    default="configs/default.ini",
+    help="The path for a config file. Otherwise the default config is used.",
+)
+@click.option(
+    "--smell-types",
+    type=click.Choice(get_smell_types(), case_sensitive=False),
+    multiple=True,
+    help="The type of smell_types being analyzed.",
+)
+def lsp(
+    tech: Optional[str],
+    config: str,
+    smell_types: Tuple[str, ...],
+) -> None:
+    from glitch.server import LintServer
+    from glitch.lsp import LanguageServer
+
+    __check_rego()
+    server = LintServer(__get_config(config), smell_types)
+    language_server = LanguageServer(
+        server,
+        sys.stdin.buffer,
+        sys.stdout.buffer,
+        __get_tech(tech) if tech is not None else None,
+    )
+    try:
+        language_server.serve()
+    finally:
+        server.close()
+
+
 def main() -> None:
     cli(prog_name="glitch")
 
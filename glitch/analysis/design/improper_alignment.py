@@ -1,5 +1,5 @@
 from typing import List, Optional
-from glitch.analysis.rules import Error
+from glitch.analysis.rules import Error, get_context
 from glitch.analysis.design.smell_checker import DesignSmellChecker
 from glitch.tech import Tech
 from glitch.repr.inter import *
@@ -53,10 +53,6 @@ class ImproperAlignment(DesignSmellChecker):
 
 
 class PuppetImproperAlignment(DesignSmellChecker):
-    def __init__(self):
-        self.cached_file = ""
-        self.lines = []
-
     @staticmethod
     def tech() -> Optional[Tech]:
         return Tech.puppet
@@ -65,11 +61,7 @@ class PuppetImproperAlignment(DesignSmellChecker):
         if not isinstance(element, AtomicUnit) and not isinstance(element, UnitBlock):
             return []
 
-        if self.cached_file != file:
-            with open(file, "r") as f:
-                self.lines = f.readlines()
-                self.cached_file = file
-        lines = self.lines
+        lines = get_context().get_source(file).lines
 
         longest = 0
         longest_ident = 0
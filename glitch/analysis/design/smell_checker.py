@@ -1,13 +1,16 @@
 from typing import Optional, List
-from glitch.analysis.rules import SmellChecker
+from glitch.analysis.rules import SmellChecker, get_context
 from glitch.tech import Tech
 
 
 class DesignSmellChecker(SmellChecker):
-    def __init__(self) -> None:
-        super().__init__()
-        self.code_lines: List[str] = []
-        self.variables_names: List[str] = []
+    @property
+    def code_lines(self) -> List[str]:
+        return get_context().code_lines
+
+    @property
+    def variables_names(self) -> List[str]:
+        return get_context().variables_names
 
     @staticmethod
     def tech() -> Optional[Tech]:
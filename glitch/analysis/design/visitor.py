@@ -2,7 +2,7 @@ import json
 import configparser
 
 from cmath import inf
-from glitch.analysis.rules import Error, RuleVisitor
+from glitch.analysis.rules import Error, RuleVisitor, get_context
 from glitch.tech import Tech
 from glitch.repr.inter import *
 from typing import List, Type
@@ -50,10 +50,7 @@ class DesignVisitor(RuleVisitor):
         else:
             self.comment = "//"
 
-        self.variable_stack: List[int] = []
-        self.variables_names: List[str] = []
         self.first_code_line = inf
-        self.code_lines: List[str] = []
 
     @staticmethod
     def get_name() -> str:
@@ -81,19 +78,18 @@ class DesignVisitor(RuleVisitor):
         return errors
 
     def check_unitblock(self, u: UnitBlock, file: str) -> List[Error]:
+        context = get_context()
         if u.path != "":
-            with open(u.path, "r") as f:
-                try:
-                    self.code_lines = f.readlines()
-                    f.seek(0, 0)
-                except UnicodeDecodeError:
-                    return []
+            try:
+                context.code_lines = context.get_source(u.path).lines
+            except UnicodeDecodeError:
+                return []
         else:
-            self.code_lines = []
+            context.code_lines = []
 
-        self.variable_stack.append(len(self.variables_names))
+        context.variable_stack.append(len(context.variables_names))
         for attr in u.attributes:
-            self.variables_names.append(attr.name)
+            context.variables_names.append(attr.name)
 
         errors: List[Error] = []
         # The order is important
@@ -117,8 +113,6 @@ class DesignVisitor(RuleVisitor):
         #     errors.append(Error('design_unnecessary_abstraction', u, file, repr(u)))
 
         for checker in self.checkers:
-            checker.code_lines = self.code_lines
-            checker.variables_names = self.variables_names
             errors += checker.check(u, file)
 
         # The unit blocks inside should only be considered after in order to
@@ -126,11 +120,8 @@ class DesignVisitor(RuleVisitor):
         for ub in u.unit_blocks:
             errors += self.check_unitblock(ub, file)
 
-        variable_size = self.variable_stack.pop()
-        if variable_size == 0:
-            self.variables_names = []
-        else:
-            self.variables_names = self.variables_names[:variable_size]
+        variable_size = context.variable_stack.pop()
+        del context.variables_names[variable_size:]
 
         return errors
 
@@ -140,7 +131,6 @@ class DesignVisitor(RuleVisitor):
     def check_atomicunit(self, au: AtomicUnit, file: str) -> list[Error]:
         errors = super().check_atomicunit(au, file)
         for checker in self.checkers:
-            checker.code_lines = self.code_lines
             errors += checker.check(au, file)
         return errors
 
@@ -151,7 +141,7 @@ class DesignVisitor(RuleVisitor):
         return []
 
     def check_variable(self, v: Variable, file: str) -> list[Error]:
-        self.variables_names.append(v.name)
+        get_context().variables_names.append(v.name)
         return []
 
     def check_comment(self, c: Comment, file: str) -> list[Error]:
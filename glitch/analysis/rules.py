@@ -1,11 +1,71 @@
-from typing import Dict, Optional, Union, List, Any
+import io
+import os
+import re
+import mmap
+import threading
+
+from array import array
+from functools import lru_cache
+from typing import Dict, Optional, Union, List, Tuple, Any
 from abc import ABC, abstractmethod
 from glitch.tech import Tech
 from glitch.repr.inter import *
 from glitch.repr.inter import UNDEFINED_POSITION
+from glitch.repr.source import Source
 
 ErrorValue = Dict[Tech | str, Dict[str, str] | str]
 ErrorDict = Dict[str, ErrorValue]
+# (code, path, line, repr, opt_msg, column, end_line, end_column)
+ErrorRecord = Tuple[str, str, int, str, Optional[str], int, int, int]
+
+
+# Files up to this size have their lines cached while their errors are printed
+MAX_CACHED_SOURCE_SIZE = 1 << 22
+# Line endings, as translated by the universal newlines of open()
+_NEWLINE = re.compile(rb"\r\n|\r|\n")
+
+
+@lru_cache(maxsize=16)
+def _read_lines(path: str, mtime: int, size: int) -> List[str]:
+    # The modification time and size are part of the key so that the lines
+    # are read again if the file changes (e.g. in glitch serve)
+    with open(path) as f:
+        return f.readlines()
+
+
+@lru_cache(maxsize=4)
+def _line_offsets(path: str, mtime: int, size: int) -> "array[int]":
+    # The offset where each line starts, so that a line can be read without
+    # reading the lines before it
+    offsets = array("Q", [0])
+    if size > 0:
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            offsets.extend(m.end() for m in _NEWLINE.finditer(data))
+    if len(offsets) > 1 and offsets[-1] == size:
+        offsets.pop()
+    return offsets
+
+
+def get_source_line(path: str, line: int) -> str:
+    """The line (starting at 1) of the file in path. The errors of a file are
+    usually printed together, so the lines of the last files read are kept,
+    except for files too large to be kept in memory, for which only the
+    offsets of their lines are kept."""
+    stat = os.stat(path)
+    if stat.st_size <= MAX_CACHED_SOURCE_SIZE or line < 1:
+        return _read_lines(path, stat.st_mtime_ns, stat.st_size)[line - 1]
+
+    offsets = _line_offsets(path, stat.st_mtime_ns, stat.st_size)
+    if line > len(offsets) or stat.st_size == 0:
+        raise IndexError("list index out of range")
+    end = offsets[line] if line < len(offsets) else stat.st_size
+    with open(path, "rb") as f:
+        f.seek(offsets[line - 1])
+        data = f.read(end - offsets[line - 1])
+    # Decoded as open() would, with the line ending translated to a newline
+    return io.TextIOWrapper(io.BytesIO(data)).read()
 
 
 class Error:
@@ -84,6 +144,9 @@ class Error:
         self.path = path
         self.repr = repr
         self.opt_msg = opt_msg
+        # The errors found by the analyses reuse the content of their file
+        context: Optional[CheckContext] = getattr(_local, "context", None)
+        self.source = None if context is None else context.sources.get(path)
 
         if isinstance(self.el, CodeElement):
             if (
@@ -98,8 +161,38 @@ class Error:
                 self.line = self.el.line - 1
             else:
                 self.line = self.el.line
+            self.column = self.el.column
+            self.end_line = self.el.end_line
+            self.end_column = self.el.end_column
         else:
             self.line = -1
+            self.column = -1
+            self.end_line = -1
+            self.end_column = -1
+
+    def to_record(self) -> ErrorRecord:
+        """Compact form of the error, without the reference to the IR element,
+        that can be cheaply sent between processes."""
+        return (
+            self.code,
+            self.path,
+            self.line,
+            self.repr,
+            self.opt_msg,
+            self.column,
+            self.end_line,
+            self.end_column,
+        )
+
+    @staticmethod
+    def from_record(record: ErrorRecord) -> "Error":
+        code, path, line, repr, opt_msg, column, end_line, end_column = record
+        error = Error(code, None, path, repr, opt_msg)
+        error.line = line
+        error.column = column
+        error.end_line = end_line
+        error.end_column = end_column
+        return error
 
     def to_csv(self) -> str:
         repr = self.repr.split("\n")[0].strip()
@@ -109,23 +202,21 @@ class Error:
             return f"{self.path},{self.line},{self.code},-,{repr}"
 
     def __repr__(self) -> str:
-        with open(self.path) as f:
-            line = (
-                f.readlines()[self.line - 1].strip()
-                if self.line != UNDEFINED_POSITION
-                else self.repr.split("\n")[0]
-            )
-            if self.opt_msg:
-                line += f"\n-> {self.opt_msg}"
-
-            if self.line == UNDEFINED_POSITION:
-                return (
-                    f"{self.path}\nIssue: {Error.ALL_ERRORS[self.code]}\n" + f"{line}\n"
-                )
-            return (
-                f"{self.path}\nIssue on line {self.line}: {Error.ALL_ERRORS[self.code]}\n"
-                + f"{line}\n"
-            )
+        if self.line == UNDEFINED_POSITION:
+            line = self.repr.split("\n")[0]
+        elif self.source is not None:
+            line = self.source.line(self.line).strip()
+        else:
+            line = get_source_line(self.path, self.line).strip()
+        if self.opt_msg:
+            line += f"\n-> {self.opt_msg}"
+
+        if self.line == UNDEFINED_POSITION:
+            return f"{self.path}\nIssue: {Error.ALL_ERRORS[self.code]}\n" + f"{line}\n"
+        return (
+            f"{self.path}\nIssue on line {self.line}: {Error.ALL_ERRORS[self.code]}\n"
+            + f"{line}\n"
+        )
 
     def __hash__(self):
         return hash((self.code, self.path, self.line, self.opt_msg))
@@ -259,20 +350,82 @@ class Checker(ABC):
         return False
 
 
+class CheckContext:
+    """State of a single call to RuleVisitor.check.
+
+    The visitors and their checkers are shared by every file (and thread)
+    being analyzed, so anything that depends on the code being checked is
+    kept here instead of in their attributes."""
+
+    def __init__(self, code: Optional[Project | Module | UnitBlock]) -> None:
+        self.code = code
+        # Lines of the unit block being checked
+        self.code_lines: List[str] = []
+        # Variables in scope, and where each enclosing unit block's start
+        self.variables_names: List[str] = []
+        self.variable_stack: List[int] = []
+        # Content of the files being checked, by path
+        self.sources: Dict[str, Source] = {}
+        if code is not None:
+            self.__add_sources(code)
+
+    def __add_sources(self, code: Project | Module | UnitBlock) -> None:
+        if isinstance(code, Project):
+            for m in code.modules:
+                self.__add_sources(m)
+            for u in code.blocks:
+                self.__add_sources(u)
+        elif isinstance(code, Module):
+            for m in code.modules:
+                self.__add_sources(m)
+            for u in code.blocks:
+                self.__add_sources(u)
+        else:
+            if code.source is not None:
+                self.sources.setdefault(code.source.path, code.source)
+            for u in code.unit_blocks:
+                self.__add_sources(u)
+
+    def get_source(self, path: str) -> Source:
+        """The content of the file in path, which is only read if the parser
+        did not keep it."""
+        if path not in self.sources:
+            self.sources[path] = Source(path)
+        return self.sources[path]
+
+
+_local = threading.local()
+
+
+def get_context() -> CheckContext:
+    """The context of the check running in the current thread."""
+    context: Optional[CheckContext] = getattr(_local, "context", None)
+    if context is None:
+        context = _local.context = CheckContext(None)
+    return context
+
+
 class RuleVisitor(ABC):
     def __init__(self, tech: Tech) -> None:
         super().__init__()
         self.tech = tech
-        self.code = None
+
+    @property
+    def code(self) -> Optional[Project | Module | UnitBlock]:
+        return get_context().code
 
     def check(self, code: Project | Module | UnitBlock) -> List[Error]:
-        self.code = code
-        if isinstance(code, Project):
-            return self.check_project(code)
-        elif isinstance(code, Module):
-            return self.check_module(code)
-        else:
-            return self.check_unitblock(code, code.path)
+        previous = getattr(_local, "context", None)
+        _local.context = CheckContext(code)
+        try:
+            if isinstance(code, Project):
+                return self.check_project(code)
+            elif isinstance(code, Module):
+                return self.check_module(code)
+            else:
+                return self.check_unitblock(code, code.path)
+        finally:
+            _local.context = previous
 
     def check_element(self, c: CodeElement, file: str) -> list[Error]:
         if isinstance(c, AtomicUnit):
@@ -374,8 +527,9 @@ class RuleVisitor(ABC):
 
 
 class SmellChecker(ABC):
-    def __init__(self) -> None:
-        self.code: Optional[Project | UnitBlock | Module] = None
+    @property
+    def code(self) -> Optional[Project | UnitBlock | Module]:
+        return get_context().code
 
     @abstractmethod
     def check(self, element: CodeElement, file: str) -> list[Error]:
@@ -3,7 +3,6 @@ import json
 import glitch
 import configparser
 from glitch.analysis.rules import Error, RuleVisitor, SmellChecker
-from nltk.tokenize import WordPunctTokenizer  # type: ignore
 from typing import List, Type, Dict
 
 from glitch.tech import Tech
@@ -242,7 +241,6 @@ class SecurityVisitor(RuleVisitor):
         errors = super().check_atomicunit(au, file)
 
         for checker in self.checkers:
-            checker.code = self.code
             errors += checker.check(au, file)
 
         return errors
@@ -255,7 +253,6 @@ class SecurityVisitor(RuleVisitor):
         c.name = c.name.strip().lower()
 
         for checker in self.checkers:
-            checker.code = self.code
             errors += checker.check(c, file)
 
         return errors
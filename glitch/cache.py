@@ -0,0 +1,183 @@
+import os
+import json
+import zlib
+import pickle
+import hashlib
+import inspect
+import tempfile
+import configparser
+import importlib.metadata
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from glitch.tech import Tech
+from glitch.analysis.rules import Error, ErrorRecord, RuleVisitor
+from glitch.stats.stats import FileStats
+from glitch.repr.inter import UnitBlockType
+from glitch.exclude import Excludes
+
+
+def glitch_version() -> str:
+    try:
+        return importlib.metadata.version("glitch")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _digest_file(path: str, digest: "hashlib._Hash") -> None:
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 16):
+            digest.update(chunk)
+
+
+def digest_path(path: str, excludes: Excludes = Excludes()) -> str:
+    """SHA-256 of the content of a file or, for folders, of the relative path
+    and content of every file inside them that is not excluded."""
+    digest = hashlib.sha256()
+    if os.path.isfile(path):
+        _digest_file(path, digest)
+        return digest.hexdigest()
+
+    for root, dirs, files in excludes.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file = os.path.join(root, name)
+            if os.path.islink(file) or not os.path.isfile(file):
+                continue
+            digest.update(os.path.relpath(file, path).encode("utf-8") + b"\0")
+            _digest_file(file, digest)
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_entry(folder: str, *parts: str) -> str:
+    key = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+    return os.path.join(folder, key[:2], f"{key}.pickle")
+
+
+def load_entry(entry: str) -> Optional[Any]:
+    try:
+        with open(entry, "rb") as f:
+            return pickle.loads(zlib.decompress(f.read()))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupted or incompatible entries are computed again and replaced
+        return None
+
+
+def store_entry(entry: str, value: Any) -> None:
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        # The IR repeats the code of the elements, so it compresses well
+        data = zlib.compress(data, 1)
+    except RecursionError:
+        # Too deep to be pickled, it will be computed every time
+        return
+
+    folder = os.path.dirname(entry)
+    os.makedirs(folder, exist_ok=True)
+    # Written to a temporary file first so that concurrent runs never
+    # read a partial entry
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, entry)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def digest_config(config: str) -> str:
+    """SHA-256 of the values in a config file. Comments, whitespace and the
+    order of the keys do not change it."""
+    parser = configparser.ConfigParser()
+    parser.read(config)
+    values = {s: dict(parser.items(s)) for s in parser.sections()}
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode()).hexdigest()
+
+
+def digest_rules(
+    smells: Iterable[str],
+    rego_modules: Dict[str, str],
+    analyses: Iterable[RuleVisitor] = (),
+) -> str:
+    """SHA-256 of the smells being analyzed, of the Rego modules that
+    implement them and of the source files of the Python visitors and
+    checkers that implement the others (and of the classes they extend), so
+    that editing a checker invalidates the results without a new version."""
+    rules = {"smells": sorted(smells), "rego": rego_modules}
+    digest = hashlib.sha256(json.dumps(rules, sort_keys=True).encode())
+
+    classes: List[type] = []
+    for analysis in analyses:
+        classes.append(type(analysis))
+        classes += [type(c) for c in getattr(analysis, "checkers", [])]
+    files: Set[str] = set()
+    for c in classes:
+        for base in inspect.getmro(c):
+            try:
+                file = inspect.getsourcefile(base)
+            except TypeError:
+                # Built-in classes, such as object
+                continue
+            if file is not None:
+                files.add(file)
+    for file in sorted(files):
+        digest.update(b"\0")
+        _digest_file(file, digest)
+    return digest.hexdigest()
+
+
+# Bumped whenever the stored records or stats change their layout
+RESULTS_FORMAT = "3"
+
+
+class ResultsCache:
+    """Stores the errors (and stats) found in each file analyzed by lint.
+
+    Entries are keyed by the path and content of the file, its type, the
+    technology, the values in the config, the smells, Rego modules and
+    Python checkers being used and the version of GLITCH. Changing any of
+    them, such as a single key of the config, a single Rego module or the
+    source of a checker, invalidates the entry."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        tech: Tech,
+        config: str,
+        smells: Iterable[str],
+        rego_modules: Dict[str, str],
+        analyses: Iterable[RuleVisitor] = (),
+    ) -> None:
+        self.folder = os.path.join(cache_dir, "results")
+        self.key = [
+            glitch_version(),
+            RESULTS_FORMAT,
+            tech.tech,
+            digest_config(config),
+            digest_rules(smells, rego_modules, analyses),
+        ]
+
+    def entry(self, path: str, type: UnitBlockType) -> Optional[str]:
+        try:
+            return cache_entry(
+                self.folder,
+                *self.key,
+                UnitBlockType(type).value,
+                path,
+                digest_path(path),
+            )
+        except OSError:
+            return None
+
+    def load(self, entry: str) -> Optional[Tuple[List[ErrorRecord], FileStats]]:
+        result = load_entry(entry)
+        if result is not None:
+            # Nothing was parsed or analyzed this time
+            result[1].parse_time = result[1].analysis_time = 0.0
+        return result
+
+    def store(self, entry: str, errors: Iterable[Error], stats: FileStats) -> None:
+        store_entry(entry, ([e.to_record() for e in errors], stats))
@@ -0,0 +1,142 @@
+"""Files and folders left out of the analysis of a folder.
+
+The patterns are globs, given with --exclude or one per line in a
+.glitchignore file (where blank lines and lines starting with # are
+skipped). Patterns without a slash match the name of a file or folder at
+any depth (e.g. "node_modules" or "*.auto.tfvars"), and the others match
+its path relative to the analyzed folder (e.g. "roles/vendor/*"). A
+trailing slash only matches folders.
+
+The patterns are checked while the folders are traversed, so the excluded
+folders are never descended into.
+"""
+
+import os
+import re
+import fnmatch
+
+from typing import Iterator, List, Optional, Tuple
+from glitch.tech import Tech
+
+IGNORE_FILE = ".glitchignore"
+
+# Folders of version control systems, package managers and other tools,
+# which never hold the code being analyzed
+COMMON_EXCLUDES = [".git/", ".hg/", ".svn/", "node_modules/", "__pycache__/"]
+
+DEFAULT_EXCLUDES = {
+    Tech.ansible: COMMON_EXCLUDES + [".tox/", ".cache/"],
+    Tech.chef: COMMON_EXCLUDES + [".kitchen/", ".bundle/", "berks-cookbooks/"],
+    Tech.puppet: COMMON_EXCLUDES + [".bundle/", "**/spec/fixtures/"],
+    Tech.terraform: COMMON_EXCLUDES + [".terraform/", ".terragrunt-cache/"],
+    Tech.gha: COMMON_EXCLUDES,
+}
+
+
+def _compile(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+    if len(patterns) == 0:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+class Excludes:
+    def __init__(self, patterns: List[str] = [], root: str = ".") -> None:
+        self.patterns = list(patterns)
+        self.root = root
+
+        # Names and relative paths, matched by any file or only by folders
+        groups: Tuple[List[str], List[str], List[str], List[str]] = ([], [], [], [])
+        for pattern in self.patterns:
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anywhere = pattern.startswith("**/")
+            if anywhere:
+                pattern = pattern[3:]
+            relative = "/" in pattern
+            pattern = pattern.lstrip("/")
+            if pattern == "":
+                continue
+
+            group = groups[2 * relative + dir_only]
+            group.append(pattern)
+            if anywhere and relative:
+                # Also below the root, since * matches slashes too
+                group.append("*/" + pattern)
+        self.__names, self.__dir_names, self.__paths, self.__dir_paths = (
+            _compile(group) for group in groups
+        )
+
+    @staticmethod
+    def load(root: str, tech: Tech, patterns: List[str], defaults: bool) -> "Excludes":
+        """The default patterns of the technology (if defaults is set),
+        followed by the ones in the .glitchignore file of root (if it is a
+        folder) and the ones given."""
+        all_patterns = list(DEFAULT_EXCLUDES[tech]) if defaults else []
+        if not os.path.isdir(root):
+            root = os.path.dirname(root) or "."
+        ignore_file = os.path.join(root, IGNORE_FILE)
+        if os.path.isfile(ignore_file):
+            with open(ignore_file) as f:
+                for line in f:
+                    line = line.strip()
+                    if line != "" and not line.startswith("#"):
+                        all_patterns.append(line)
+        return Excludes(all_patterns + patterns, root)
+
+    def excluded(self, path: str, is_dir: bool) -> bool:
+        name = os.path.basename(os.path.normpath(path))
+        if self.__names is not None and self.__names.match(name):
+            return True
+        if is_dir and self.__dir_names is not None and self.__dir_names.match(name):
+            return True
+
+        if self.__paths is None and (not is_dir or self.__dir_paths is None):
+            return False
+        relative = os.path.relpath(path, self.root).replace(os.sep, "/")
+        if self.__paths is not None and self.__paths.match(relative):
+            return True
+        return (
+            is_dir
+            and self.__dir_paths is not None
+            and self.__dir_paths.match(relative) is not None
+        )
+
+    def excluded_below(self, path: str, root: str) -> bool:
+        """Whether the file in path, or any folder between root and it, is
+        excluded, i.e. whether the file is skipped when root is traversed."""
+        folder = root
+        for name in os.path.relpath(os.path.dirname(path), root).split(os.sep):
+            if name != ".":
+                folder = os.path.join(folder, name)
+                if self.excluded(folder, True):
+                    return True
+        return self.excluded(path, False)
+
+    def scandir(self, path: str) -> List[os.DirEntry[str]]:
+        return [f for f in os.scandir(path) if not self.excluded(f.path, f.is_dir())]
+
+    def listdir(self, path: str) -> List[str]:
+        return [f.name for f in self.scandir(path)]
+
+    def walk(
+        self, top: str, topdown: bool = True
+    ) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Like os.walk, without the excluded files and folders."""
+        try:
+            entries = self.scandir(top)
+        except OSError:
+            return
+
+        dirs: List[str] = []
+        files: List[str] = []
+        for entry in entries:
+            (dirs if entry.is_dir() else files).append(entry.name)
+
+        if topdown:
+            yield top, dirs, files
+        for name in dirs:
+            path = os.path.join(top, name)
+            if not os.path.islink(path):
+                yield from self.walk(path, topdown)
+        if not topdown:
+            yield top, dirs, files
@@ -1,7 +1,9 @@
-from typing import List, Tuple, Iterable, Dict
+from typing import List, Set, Tuple, Iterable, Dict
 from glitch.tech import Tech
 from glitch.analysis.rules import Error
 import configparser
+import subprocess
+import os
 
 
 def get_smell_types() -> Tuple[str, ...]:
@@ -149,3 +151,40 @@ def ini_to_json_dict(config_path: str) -> Dict[str, Dict[str, List[str]]]:
         result[section] = section_data
 
     return result
+
+
+def get_changed_files(path: str, ref: str) -> Set[str]:
+    """Get the files that changed since a git reference, in the repository
+    that contains the given path. This includes uncommitted changes and
+    untracked files, but not deleted files.
+
+    Args:
+        path (str): Path inside the git repository.
+        ref (str): The git reference to compare against.
+
+    Raises:
+        ValueError: If the path is not in a git repository or the reference
+            does not exist.
+
+    Returns:
+        Set[str]: The real paths of the changed files.
+    """
+    folder = path if os.path.isdir(path) else os.path.dirname(path) or "."
+
+    def git(*args: str) -> str:
+        run = subprocess.run(
+            ["git", "-C", folder, *args], capture_output=True, text=True
+        )
+        if run.returncode != 0:
+            raise ValueError(run.stderr.strip())
+        return run.stdout
+
+    root = git("rev-parse", "--show-toplevel").strip()
+    changed = git("diff", "--name-only", "-z", "--diff-filter=d", ref, "--")
+    untracked = git("ls-files", "--others", "--exclude-standard", "-z", "--full-name")
+
+    files: Set[str] = set()
+    for name in (changed + untracked).split("\0"):
+        if name != "":
+            files.add(os.path.realpath(os.path.join(root, name)))
+    return files
@@ -0,0 +1,235 @@
+"""Language Server Protocol front end used by `glitch lsp`.
+
+Only the parts of the protocol needed to publish diagnostics are supported:
+the documents are synchronized in full on every change and analyzed by a
+background thread. Edits that arrive while a document is waiting to be
+analyzed replace it, and the diagnostics of an analysis are dropped if the
+document changed in the meantime.
+
+The file on disk is never read, since it may not match the document. Each
+analysis writes the text of the document to a temporary file instead (see
+Linter.lint in glitch/server.py), which is parsed and removed afterwards.
+"""
+
+import sys
+import json
+import threading
+import contextlib
+
+from urllib.parse import urlparse, unquote
+from typing import IO, Any, Dict, List, Optional, Tuple
+from glitch.tech import Tech
+from glitch.cache import glitch_version
+from glitch.analysis.rules import Error
+from glitch.repr.inter import UNDEFINED_POSITION
+from glitch.server import LintServer
+
+# https://microsoft.github.io/language-server-protocol/specifications/specification-current/
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+TEXT_DOCUMENT_SYNC_FULL = 1
+SEVERITY_WARNING = 2
+
+
+def get_tech(path: str) -> Optional[Tech]:
+    extension = path.split(".")[-1]
+    if extension in Tech.gha.extensions and ".github/workflows/" in path:
+        return Tech.gha
+    for tech in Tech:
+        if extension in tech.extensions:
+            return tech
+    return None
+
+
+def uri_to_path(uri: str) -> str:
+    return unquote(urlparse(uri).path)
+
+
+class LanguageServer:
+    def __init__(
+        self,
+        server: LintServer,
+        input: IO[bytes],
+        output: IO[bytes],
+        tech: Optional[Tech] = None,
+    ) -> None:
+        self.server = server
+        self.input = input
+        self.output = output
+        self.tech = tech
+        self.running = True
+        # Text and version of the open documents, by URI
+        self.__documents: Dict[str, Tuple[int, str]] = {}
+        # Open documents waiting to be analyzed, in order of arrival
+        self.__pending: Dict[str, None] = {}
+        self.__condition = threading.Condition()
+        self.__write_lock = threading.Lock()
+
+    def __send(self, message: Dict[str, Any]) -> None:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode("utf-8")
+        with self.__write_lock:
+            self.output.write(f"Content-Length: {len(body)}\r\n\r\n".encode())
+            self.output.write(body)
+            self.output.flush()
+
+    def __read(self) -> Optional[Dict[str, Any]]:
+        length = -1
+        while True:
+            header = self.input.readline()
+            if header == b"":
+                return None
+            header = header.strip()
+            if header == b"":
+                break
+            name, _, value = header.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+
+        if length < 0:
+            raise ValueError("Message without Content-Length")
+        return json.loads(self.input.read(length))
+
+    def __diagnostics(self, errors: List[Error], lines: List[str]) -> List[Any]:
+        diagnostics: List[Any] = []
+        for error in errors:
+            line = error.line - 1
+            if error.line == UNDEFINED_POSITION or line < 0 or line >= len(lines):
+                line = 0
+            message = Error.ALL_ERRORS[error.code]
+            if error.opt_msg:
+                message += f"\n-> {error.opt_msg}"
+            diagnostics.append(
+                {
+                    "range": {
+                        "start": {"line": line, "character": 0},
+                        "end": {"line": line, "character": len(lines[line])},
+                    },
+                    "severity": SEVERITY_WARNING,
+                    "code": error.code,
+                    "source": "glitch",
+                    "message": message,
+                }
+            )
+        return diagnostics
+
+    def __publish(self, uri: str, version: Optional[int], diagnostics: List[Any]):
+        params: Dict[str, Any] = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        self.__send({"method": "textDocument/publishDiagnostics", "params": params})
+
+    def __analyze(self, uri: str, version: int, text: str) -> None:
+        path = uri_to_path(uri)
+        tech = self.tech if self.tech is not None else get_tech(path)
+        if tech is None:
+            return
+
+        try:
+            errors = self.server.lint(tech.tech, path, content=text)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            errors = []
+        errors = [e for e in errors if e.path == path]
+
+        with self.__condition:
+            # A newer version will be analyzed (or the document was closed)
+            if self.__documents.get(uri, (None, None))[0] != version:
+                return
+        self.__publish(
+            uri, version, self.__diagnostics(errors, text.splitlines() or [""])
+        )
+
+    def __analyze_pending(self) -> None:
+        while True:
+            with self.__condition:
+                while self.running and len(self.__pending) == 0:
+                    self.__condition.wait()
+                if not self.running:
+                    return
+                uri = next(iter(self.__pending))
+                del self.__pending[uri]
+                version, text = self.__documents[uri]
+            self.__analyze(uri, version, text)
+
+    def __update(self, uri: str, version: int, text: Optional[str]) -> None:
+        with self.__condition:
+            if text is None:
+                self.__documents.pop(uri, None)
+                self.__pending.pop(uri, None)
+            else:
+                self.__documents[uri] = (version, text)
+                self.__pending[uri] = None
+                self.__condition.notify()
+
+    def __handle(self, message: Dict[str, Any]) -> None:
+        method = message.get("method")
+        params = message.get("params", {})
+        result: Any = None
+
+        if method == "initialize":
+            options = params.get("initializationOptions") or {}
+            if self.tech is None and "tech" in options:
+                self.tech = next((t for t in Tech if t.tech == options["tech"]), None)
+            result = {
+                "capabilities": {
+                    "textDocumentSync": {
+                        "openClose": True,
+                        "change": TEXT_DOCUMENT_SYNC_FULL,
+                    }
+                },
+                "serverInfo": {"name": "glitch", "version": glitch_version()},
+            }
+        elif method == "shutdown":
+            result = None
+        elif method == "exit":
+            self.running = False
+        elif method == "textDocument/didOpen":
+            document = params["textDocument"]
+            self.__update(document["uri"], document["version"], document["text"])
+        elif method == "textDocument/didChange":
+            document = params["textDocument"]
+            if len(params["contentChanges"]) > 0:
+                text = params["contentChanges"][-1]["text"]
+                self.__update(document["uri"], document["version"], text)
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.__update(uri, -1, None)
+            self.__publish(uri, None, [])
+        elif "id" in message:
+            self.__send(
+                {
+                    "id": message["id"],
+                    "error": {
+                        "code": METHOD_NOT_FOUND,
+                        "message": f"Unknown method: {method}",
+                    },
+                }
+            )
+            return
+
+        # Notifications (without an id) are not answered
+        if "id" in message:
+            self.__send({"id": message["id"], "result": result})
+
+    def serve(self) -> None:
+        worker = threading.Thread(target=self.__analyze_pending, daemon=True)
+        worker.start()
+        # Some parsers print their errors, which must not be mixed with the
+        # messages written to stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            while self.running:
+                message = self.__read()
+                if message is None:
+                    break
+                try:
+                    self.__handle(message)
+                except Exception as e:
+                    print(f"Error: {e}", file=sys.stderr)
+                    if "id" in message:
+                        error = {"code": INTERNAL_ERROR, "message": str(e)}
+                        self.__send({"id": message["id"], "error": error})
+
+        with self.__condition:
+            self.running = False
+            self.__condition.notify_all()
+        worker.join()
@@ -1,7 +1,7 @@
 import os
 
 from glitch.parsers.yaml import YamlParser
-from typing import List, TextIO, Any, Optional, Callable
+from typing import List, Any, Optional, Callable
 from ruamel.yaml.main import YAML
 from ruamel.yaml.nodes import (
     Node,
@@ -11,6 +11,7 @@ from ruamel.yaml.nodes import (
 from ruamel.yaml.tokens import Token
 from glitch.exceptions import EXCEPTIONS, throw_exception
 from glitch.repr.inter import *
+from glitch.repr.source import Source, SourceFile
 
 
 class AnsibleParser(YamlParser):
@@ -209,15 +210,15 @@ class AnsibleParser(YamlParser):
                 unit_block.add_atomic_unit(au)
 
     def __parse_playbook(
-        self, name: str, file: TextIO, parsed_file: Optional[Node] = None
+        self, name: str, file: SourceFile, parsed_file: Optional[Node] = None
     ) -> Optional[UnitBlock]:
         try:
             if parsed_file is None:
                 parsed_file = YAML().compose(file)
             unit_block = UnitBlock(name, UnitBlockType.script)
             unit_block.path = file.name
-            file.seek(0, 0)
-            code = file.readlines()
+            unit_block.source = file.source
+            code = list(file.source.lines)
             code.append("")  # HACK allows to parse code in the end of the file
 
             if parsed_file is None:
@@ -227,6 +228,7 @@ class AnsibleParser(YamlParser):
                 # Plays are unit blocks inside a unit block
                 play = UnitBlock("", UnitBlockType.block)
                 play.path = file.name
+                play.source = file.source
 
                 for key, value in p.value:
                     if key.value == "name" and play.name == "":
@@ -244,7 +246,7 @@ class AnsibleParser(YamlParser):
 
                 unit_block.add_unit_block(play)
 
-            for comment in self._get_comments(parsed_file, file):
+            for comment in self._get_comments(parsed_file, file.source.lines):
                 c = Comment(comment[1])
                 c.line = comment[0]
                 c.code = code[c.line - 1]
@@ -256,22 +258,22 @@ class AnsibleParser(YamlParser):
             return None
 
     def __parse_tasks_file(
-        self, name: str, file: TextIO, parsed_file: Optional[Node] = None
+        self, name: str, file: SourceFile, parsed_file: Optional[Node] = None
     ) -> Optional[UnitBlock]:
         try:
             if parsed_file is None:
                 parsed_file = YAML().compose(file)
             unit_block = UnitBlock(name, UnitBlockType.tasks)
             unit_block.path = file.name
-            file.seek(0, 0)
-            code = file.readlines()
+            unit_block.source = file.source
+            code = list(file.source.lines)
             code.append("")  # HACK allows to parse code in the end of the file
 
             if parsed_file is None:
                 return unit_block
 
             self.__parse_tasks(unit_block, parsed_file, code)
-            for comment in self._get_comments(parsed_file, file):
+            for comment in self._get_comments(parsed_file, file.source.lines):
                 c = Comment(comment[1])
                 c.line = comment[0]
                 c.code = code[c.line - 1]
@@ -283,15 +285,15 @@ class AnsibleParser(YamlParser):
             return None
 
     def __parse_vars_file(
-        self, name: str, file: TextIO, parsed_file: Optional[Node] = None
+        self, name: str, file: SourceFile, parsed_file: Optional[Node] = None
     ) -> Optional[UnitBlock]:
         try:
             if parsed_file is None:
                 parsed_file = YAML().compose(file)
             unit_block = UnitBlock(name, UnitBlockType.vars)
             unit_block.path = file.name
-            file.seek(0, 0)
-            code = file.readlines()
+            unit_block.source = file.source
+            code = list(file.source.lines)
             code.append("")  # HACK allows to parse code in the end of the file
 
             if parsed_file is None:
@@ -301,7 +303,7 @@ class AnsibleParser(YamlParser):
             vars = self.__parse_vars(parsed_file, code)
             for v in vars:
                 unit_block.add_variable(v)
-            for comment in self._get_comments(parsed_file, file):
+            for comment in self._get_comments(parsed_file, file.source.lines):
                 c = Comment(comment[1])
                 c.line = comment[0]
                 c.code = code[c.line - 1]
@@ -312,23 +314,28 @@ class AnsibleParser(YamlParser):
             throw_exception(EXCEPTIONS["ANSIBLE_VARS_FILE"], file.name)
             return None
 
-    @staticmethod
     def __apply_to_files(
+        self,
         module: Module | Project,
         path: str,
-        p_function: Callable[[str, TextIO], Optional[UnitBlock]],
+        p_function: Callable[[str, SourceFile], Optional[UnitBlock]],
     ) -> None:
-        if os.path.exists(path) and os.path.isdir(path) and not os.path.islink(path):
+        if (
+            os.path.exists(path)
+            and os.path.isdir(path)
+            and not os.path.islink(path)
+            and not self.excludes.excluded(path, True)
+        ):
             files = [
                 f
-                for f in os.listdir(path)
+                for f in self.excludes.listdir(path)
                 if os.path.isfile(os.path.join(path, f))
                 and not f.startswith(".")
                 and f.endswith((".yml", ".yaml"))
             ]
             for file in files:
                 f_path = os.path.join(path, file)
-                with open(f_path) as f:
+                with Source(f_path).open() as f:
                     unit_block = p_function(f_path, f)
                     if unit_block is not None:
                         module.add_block(unit_block)
@@ -337,24 +344,25 @@ class AnsibleParser(YamlParser):
         res: Module = Module(os.path.basename(os.path.normpath(path)), path)
         super().parse_file_structure(res.folder, path)
 
-        AnsibleParser.__apply_to_files(res, f"{path}/tasks", self.__parse_tasks_file)
-        AnsibleParser.__apply_to_files(res, f"{path}/handlers", self.__parse_tasks_file)
-        AnsibleParser.__apply_to_files(res, f"{path}/vars", self.__parse_vars_file)
-        AnsibleParser.__apply_to_files(res, f"{path}/defaults", self.__parse_vars_file)
+        self.__apply_to_files(res, f"{path}/tasks", self.__parse_tasks_file)
+        self.__apply_to_files(res, f"{path}/handlers", self.__parse_tasks_file)
+        self.__apply_to_files(res, f"{path}/vars", self.__parse_vars_file)
+        self.__apply_to_files(res, f"{path}/defaults", self.__parse_vars_file)
 
         # Check subfolders
         subfolders = [
-            f.path for f in os.scandir(f"{path}/") if f.is_dir() and not f.is_symlink()
+            f.path
+            for f in self.excludes.scandir(f"{path}/")
+            if f.is_dir() and not f.is_symlink()
         ]
-        for d in subfolders:
-            if os.path.basename(os.path.normpath(d)) not in [
-                "tasks",
-                "handlers",
-                "vars",
-                "defaults",
-            ]:
-                aux = self.parse_module(d)
-                res.blocks += aux.blocks
+        subfolders = [
+            d
+            for d in subfolders
+            if os.path.basename(os.path.normpath(d))
+            not in ["tasks", "handlers", "vars", "defaults"]
+        ]
+        for aux in self.parse_modules(subfolders):
+            res.blocks += aux.blocks
 
         return res
 
@@ -366,26 +374,30 @@ class AnsibleParser(YamlParser):
         res: Project = Project(os.path.basename(os.path.normpath(path)))
 
         if root:
-            AnsibleParser.__apply_to_files(res, f"{path}", self.__parse_playbook)
-        AnsibleParser.__apply_to_files(res, f"{path}/playbooks", self.__parse_playbook)
-        AnsibleParser.__apply_to_files(
-            res, f"{path}/group_vars", self.__parse_vars_file
-        )
-        AnsibleParser.__apply_to_files(res, f"{path}/host_vars", self.__parse_vars_file)
-        AnsibleParser.__apply_to_files(res, f"{path}/tasks", self.__parse_tasks_file)
-
-        if os.path.exists(f"{path}/roles") and not os.path.islink(f"{path}/roles"):
+            self.__apply_to_files(res, f"{path}", self.__parse_playbook)
+        self.__apply_to_files(res, f"{path}/playbooks", self.__parse_playbook)
+        self.__apply_to_files(res, f"{path}/group_vars", self.__parse_vars_file)
+        self.__apply_to_files(res, f"{path}/host_vars", self.__parse_vars_file)
+        self.__apply_to_files(res, f"{path}/tasks", self.__parse_tasks_file)
+
+        if (
+            os.path.exists(f"{path}/roles")
+            and not os.path.islink(f"{path}/roles")
+            and not self.excludes.excluded(f"{path}/roles", True)
+        ):
             subfolders = [
                 f.path
-                for f in os.scandir(f"{path}/roles")
+                for f in self.excludes.scandir(f"{path}/roles")
                 if f.is_dir() and not f.is_symlink()
             ]
-            for m in subfolders:
-                res.add_module(self.parse_module(m))
+            for module in self.parse_modules(subfolders):
+                res.add_module(module)
 
         # Check subfolders
         subfolders = [
-            f.path for f in os.scandir(f"{path}") if f.is_dir() and not f.is_symlink()
+            f.path
+            for f in self.excludes.scandir(f"{path}")
+            if f.is_dir() and not f.is_symlink()
         ]
         for d in subfolders:
             if os.path.basename(os.path.normpath(d)) not in [
@@ -401,8 +413,18 @@ class AnsibleParser(YamlParser):
 
         return res
 
+    def get_module(self, path: str, root: str) -> Optional[str]:
+        folders = self._get_folders(path, root)
+        for i, folder in enumerate(folders):
+            name = os.path.basename(folder)
+            if name == "roles":
+                return folders[i + 1] if i + 1 < len(folders) else None
+            elif name in ["playbooks", "group_vars", "host_vars", "tasks"]:
+                return None
+        return None
+
     def parse_file(self, path: str, type: UnitBlockType) -> Optional[UnitBlock]:
-        with open(path) as f:
+        with Source(path).open() as f:
             try:
                 parsed_file = YAML().compose(f)
                 f.seek(0, 0)
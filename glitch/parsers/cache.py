@@ -0,0 +1,89 @@
+import os
+
+from typing import Callable, Optional, TypeVar
+from glitch.tech import Tech
+from glitch.cache import (
+    glitch_version,
+    digest_path,
+    cache_entry,
+    load_entry,
+    store_entry,
+)
+from glitch.parsers.parser import Parser
+from glitch.repr.inter import UnitBlockType, UnitBlock, Module, Project
+
+T = TypeVar("T", UnitBlock, Module, Project)
+
+
+class CachedParser(Parser):
+    """Wraps a parser and stores the IR of every parsed path in cache_dir.
+
+    Entries are keyed by the content of the path (every file that is not
+    excluded, for folders and modules), the path itself, the technology, the
+    UnitBlockType, the exclude patterns (for folders and modules) and the
+    version of GLITCH, so an entry is only reused while none of them change.
+    Paths that cannot be parsed are never cached."""
+
+    def __init__(self, parser: Parser, tech: Tech, cache_dir: str) -> None:
+        self.parser = parser
+        self.tech = tech
+        self.folder = os.path.join(cache_dir, "ir")
+        self.version = glitch_version()
+
+    def __cached(
+        self, kind: str, path: str, type: str, parse: Callable[[], Optional[T]]
+    ) -> Optional[T]:
+        try:
+            if kind == "file":
+                entry = cache_entry(
+                    self.folder,
+                    self.version,
+                    self.tech.tech,
+                    kind,
+                    type,
+                    path,
+                    digest_path(path),
+                )
+            else:
+                excludes = self.parser.excludes
+                entry = cache_entry(
+                    self.folder,
+                    self.version,
+                    self.tech.tech,
+                    kind,
+                    type,
+                    path,
+                    digest_path(path, excludes),
+                    os.path.abspath(excludes.root),
+                    *excludes.patterns,
+                )
+        except OSError:
+            return parse()
+
+        inter = load_entry(entry)
+        if inter is None:
+            inter = parse()
+            if inter is not None:
+                store_entry(entry, inter)
+        return inter
+
+    def parse_file(self, path: str, type: UnitBlockType) -> Optional[UnitBlock]:
+        return self.__cached(
+            "file",
+            path,
+            UnitBlockType(type).value,
+            lambda: self.parser.parse_file(path, type),
+        )
+
+    def parse_folder(self, path: str) -> Project:
+        return self.__cached(  # type: ignore
+            "folder", path, "", lambda: self.parser.parse_folder(path)
+        )
+
+    def parse_module(self, path: str) -> Module:
+        return self.__cached(  # type: ignore
+            "module", path, "", lambda: self.parser.parse_module(path)
+        )
+
+    def get_module(self, path: str, root: str) -> Optional[str]:
+        return self.parser.get_module(path, root)
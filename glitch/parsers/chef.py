@@ -1,19 +1,21 @@
 import os
 import sys
 import re
-import tempfile
+import threading
 import glitch.parsers.parser as p
 
-from string import Template
-from importlib.resources import files
-from typing import Any, List, Tuple, Callable
+from typing import Any, List, Optional, Tuple, Callable
 from glitch.repr.inter import *
+from glitch.repr.source import Source
 from glitch.parsers.ripper_parser import parser_yacc
+from glitch.parsers.ripper_worker import ripper_sexp
 from glitch.helpers import remove_unmatched_brackets
 from glitch.exceptions import EXCEPTIONS, throw_exception
 
 ChefValue = Tuple[str, str] | str | int | bool | List["ChefValue"]
 
+_local = threading.local()
+
 
 def set_loc_from_info(code_element: CodeElement, info: ElementInfo) -> None:
     code_element.line = info.line
@@ -28,6 +30,16 @@ class ChefParser(p.Parser):
     https://kddnewton.com/ripper-docs/events
     """
 
+    # Subfolders whose files are parsed by a module
+    __MODULE_FOLDERS = [
+        "resources",
+        "recipes",
+        "attributes",
+        "definitions",
+        "libraries",
+        "providers",
+    ]
+
     __ADD = [
         "args_add_star",
         "args_add",
@@ -77,6 +89,16 @@ class ChefParser(p.Parser):
         super().__init__()
         self._inside_atomic_unit = False
 
+    @property
+    def _inside_atomic_unit(self) -> bool:
+        # Kept per thread, since the files of a project may be parsed
+        # concurrently by the same parser
+        return getattr(_local, "inside_atomic_unit", False)
+
+    @_inside_atomic_unit.setter
+    def _inside_atomic_unit(self, value: bool) -> None:
+        _local.inside_atomic_unit = value
+
     @staticmethod
     def _check_id(ast: Any, ids: List[Any]) -> bool:
         return isinstance(ast, ChefParser.Node) and ast.id in ids
@@ -1338,119 +1360,103 @@ class ChefParser(p.Parser):
                 if isinstance(arg, (ChefParser.Node, list)):
                     self._transverse_ast(arg, st, source)
 
-    def __parse_recipe(self, path: str, file: str) -> UnitBlock | None:
-        with open(os.path.join(path, file)) as f:
-            ripper_content = (
-                files("glitch.parsers")
-                .joinpath("resources/comments.rb.template")
-                .read_text()
-            )
-            ripper_script = Template(ripper_content)
-            ripper_script = ripper_script.substitute(
-                {"path": '"' + os.path.join(path, file) + '"'}
-            )
-
-            if "/attributes/" in path:
-                unit_block: UnitBlock = UnitBlock(file, UnitBlockType.vars)
-            else:
-                unit_block: UnitBlock = UnitBlock(file, UnitBlockType.script)
-            unit_block.path = os.path.join(path, file)
-
-            try:
-                source = f.readlines()
-            except:
-                throw_exception(
-                    EXCEPTIONS["CHEF_COULD_NOT_PARSE"], os.path.join(path, file)
-                )
-                return None
-
-            with tempfile.NamedTemporaryFile(mode="w+") as tmp:
-                tmp.write(ripper_script)
-                tmp.flush()
-
-                try:
-                    p = os.popen("ruby " + tmp.name)
-                    script_ast = p.read()
-                    p.close()
-                    comments, _ = parser_yacc(script_ast)
-                    comments.reverse()
-
-                    for comment, line in comments:
-                        c = Comment(re.sub(r"\\n$", "", comment))
-                        comment_code = source[line - 1]
-                        info = ElementInfo(
-                            line, 1, line, len(comment_code), comment_code
-                        )
-                        set_loc_from_info(c, info)
-                        unit_block.add_comment(c)
-                except:
-                    throw_exception(
-                        EXCEPTIONS["CHEF_COULD_NOT_PARSE"], os.path.join(path, file)
-                    )
-                    return None
+    @staticmethod
+    def __get_type(path: str) -> UnitBlockType:
+        if "/attributes/" in path:
+            return UnitBlockType.vars
+        return UnitBlockType.script
+
+    def __parse_recipe(
+        self, path: str, file: str, type: UnitBlockType
+    ) -> UnitBlock | None:
+        unit_block: UnitBlock = UnitBlock(file, type)
+        unit_block.path = os.path.join(path, file)
+
+        try:
+            source = Source(unit_block.path)
+            lines = source.lines
+        except:
+            throw_exception(EXCEPTIONS["CHEF_COULD_NOT_PARSE"], unit_block.path)
+            return None
 
-            try:
-                p = os.popen(
-                    "ruby -r ripper -e 'file = \
-                    File.open(\""
-                    + os.path.join(path, file)
-                    + "\")\npp Ripper.sexp_raw(file)'"
-                )
-                script_ast = p.read()
-                p.close()
-                _, program = parser_yacc(script_ast)
-                ast = ChefParser.__create_ast(program)  # type: ignore
-                self._transverse_ast(ast, unit_block, source)
-            except:
-                throw_exception(
-                    EXCEPTIONS["CHEF_COULD_NOT_PARSE"], os.path.join(path, file)
-                )
-                return None
+        try:
+            # The comments and the sexp are obtained from a single run of
+            # Ripper in one of the long-lived Ruby workers
+            script_ast = ripper_sexp(unit_block.path)
+            comments, program = parser_yacc(script_ast)
+            comments.reverse()
+
+            for comment, line in comments:
+                c = Comment(re.sub(r"\\n$", "", comment))
+                comment_code = lines[line - 1]
+                info = ElementInfo(line, 1, line, len(comment_code), comment_code)
+                set_loc_from_info(c, info)
+                unit_block.add_comment(c)
+
+            ast = ChefParser.__create_ast(program)  # type: ignore
+            self._transverse_ast(ast, unit_block, lines)
+            unit_block.set_source(source)
+        except:
+            throw_exception(EXCEPTIONS["CHEF_COULD_NOT_PARSE"], unit_block.path)
+            return None
 
-            return unit_block
+        return unit_block
 
     def parse_module(self, path: str) -> Module:
-        def parse_folder(path: str) -> None:
-            if os.path.exists(path):
-                files = [
-                    f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))
+        def get_files(path: str) -> List[Tuple[str, UnitBlockType]]:
+            if os.path.exists(path) and not self.excludes.excluded(path, True):
+                type = ChefParser.__get_type(path)
+                return [
+                    (os.path.join(path, f), type)
+                    for f in self.excludes.listdir(path)
+                    if os.path.isfile(os.path.join(path, f))
                 ]
-                for file in files:
-                    recipe = self.__parse_recipe(path, file)
-                    if recipe is not None:
-                        res.add_block(recipe)
+            return []
 
         res: Module = Module(os.path.basename(os.path.normpath(path)), path)
         super().parse_file_structure(res.folder, path)
 
-        parse_folder(path + "/resources/")
-        parse_folder(path + "/recipes/")
-        parse_folder(path + "/attributes/")
-        parse_folder(path + "/definitions/")
-        parse_folder(path + "/libraries/")
-        parse_folder(path + "/providers/")
+        files: List[Tuple[str, UnitBlockType]] = []
+        files += get_files(path + "/resources/")
+        files += get_files(path + "/recipes/")
+        files += get_files(path + "/attributes/")
+        files += get_files(path + "/definitions/")
+        files += get_files(path + "/libraries/")
+        files += get_files(path + "/providers/")
+
+        for recipe in self._map("_parse_module_file", files):
+            if recipe is not None:
+                res.add_block(recipe)
 
         return res
 
+    def _parse_module_file(self, path: str, type: UnitBlockType) -> UnitBlock | None:
+        # The modules give the type of the files in their attributes folder
+        return self.__parse_recipe(os.path.dirname(path), os.path.basename(path), type)
+
     def parse_file(self, path: str, type: UnitBlockType) -> UnitBlock | None:
-        return self.__parse_recipe(os.path.dirname(path), os.path.basename(path))
+        path, file = os.path.dirname(path), os.path.basename(path)
+        return self.__parse_recipe(path, file, ChefParser.__get_type(path))
 
     def parse_folder(self, path: str) -> Project:
         res: Project = Project(os.path.basename(os.path.normpath(path)))
 
-        res.add_module(self.parse_module(path))
-
-        if os.path.exists(f"{path}/cookbooks"):
-            cookbooks = [
+        modules = [path]
+        if os.path.exists(f"{path}/cookbooks") and not self.excludes.excluded(
+            f"{path}/cookbooks", True
+        ):
+            modules += [
                 f.path
-                for f in os.scandir(f"{path}/cookbooks")
+                for f in self.excludes.scandir(f"{path}/cookbooks")
                 if f.is_dir() and not f.is_symlink()
             ]
-            for cookbook in cookbooks:
-                res.add_module(self.parse_module(cookbook))
+        for module in self.parse_modules(modules):
+            res.add_module(module)
 
         subfolders = [
-            f.path for f in os.scandir(f"{path}") if f.is_dir() and not f.is_symlink()
+            f.path
+            for f in self.excludes.scandir(f"{path}")
+            if f.is_dir() and not f.is_symlink()
         ]
         for d in subfolders:
             if os.path.basename(os.path.normpath(d)) not in [
@@ -1467,3 +1473,21 @@ class ChefParser(p.Parser):
                 res.modules += aux.modules
 
         return res
+
+    def get_module(self, path: str, root: str) -> Optional[str]:
+        # The folders reached by parse_folder and the cookbooks are modules,
+        # which only parse the files in a few of their subfolders
+        module, cookbooks, in_cookbook = root, False, False
+        for folder in self._get_folders(path, root):
+            name = os.path.basename(folder)
+            if cookbooks:
+                module, cookbooks, in_cookbook = folder, False, True
+            elif name in ChefParser.__MODULE_FOLDERS:
+                return module if folder == os.path.dirname(path) else None
+            elif in_cookbook:
+                return None
+            elif name == "cookbooks":
+                cookbooks = True
+            else:
+                module = folder
+        return None
@@ -1,17 +1,66 @@
 import json
 import jsonschema
 
+from functools import lru_cache
 from glitch.parsers.yaml import YamlParser
 from typing import Optional
 from glitch.repr.inter import *
+from glitch.repr.source import Source
 from ruamel.yaml.main import YAML
+from ruamel.yaml.constructor import BaseConstructor
+from ruamel.yaml.error import YAMLError
 from ruamel.yaml.nodes import (
     Node,
     MappingNode,
+    SequenceNode,
 )
 from importlib.resources import files
 from glitch.exceptions import EXCEPTIONS, throw_exception
 
+MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+@lru_cache(maxsize=None)
+def _get_validator() -> Any:
+    """The validator of the workflow schema, which is loaded and checked once
+    per process instead of once per file (as jsonschema.validate does)."""
+    schema = json.loads(
+        files("glitch.parsers").joinpath("resources/github_workflow.json").read_text()
+    )
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def _construct(node: Node, constructor: BaseConstructor) -> Any:
+    """The value of a composed node, as loading the file would construct it.
+    Only the scalars are built by the constructor, since ruamel removes the
+    merge keys of the mappings it constructs from the nodes. Duplicate keys
+    raise a ValueError."""
+    if isinstance(node, MappingNode):
+        result: Dict[Any, Any] = {}
+        merged: Dict[Any, Any] = {}
+        for key, value in node.value:
+            if key.tag == MERGE_TAG:
+                values = value.value if isinstance(value, SequenceNode) else [value]
+                # The first mappings take precedence over the following ones
+                for v in reversed(values):
+                    mapping = _construct(v, constructor)
+                    if not isinstance(mapping, dict):
+                        raise ValueError("Only mappings can be merged")
+                    merged.update(mapping)  # type: ignore
+                continue
+            k = _construct(key, constructor)
+            if k in result:
+                raise ValueError(f"Duplicate key: {k}")
+            result[k] = _construct(value, constructor)
+        for k, v in merged.items():
+            result.setdefault(k, v)
+        return result
+    elif isinstance(node, SequenceNode):
+        return [_construct(item, constructor) for item in node.value]
+    return constructor.construct_object(node, deep=True)
+
 
 class GithubActionsParser(YamlParser):
     def __init__(self):
@@ -111,11 +160,12 @@ class GithubActionsParser(YamlParser):
         return job
 
     def parse_file(self, path: str, type: UnitBlockType) -> Optional[UnitBlock]:
-        with open(path) as f:
+        source = Source(path)
+        yaml = YAML()
+        with source.open() as f:
             try:
-                parsed_file = YAML().compose(f)
-                f.seek(0, 0)
-                lines = f.readlines()
+                parsed_file = yaml.compose(f)
+                lines = source.lines
             except:
                 throw_exception(EXCEPTIONS["GHA_COULD_NOT_PARSE"], path)
                 return None
@@ -124,18 +174,16 @@ class GithubActionsParser(YamlParser):
             throw_exception(EXCEPTIONS["GHA_COULD_NOT_PARSE"], path)
             return None
 
-        with open(path) as f:
-            schema = json.loads(
-                files("glitch.parsers")
-                .joinpath("resources/github_workflow.json")
-                .read_text()
-            )
-            yaml = YAML()
-            try:
-                jsonschema.validate(yaml.load(f.read()), schema)  # type: ignore
-            except jsonschema.ValidationError:
-                throw_exception(EXCEPTIONS["GHA_COULD_NOT_PARSE"], path)
-                return None
+        # The workflow is validated against the nodes that were already
+        # composed, instead of loading the file a second time
+        try:
+            workflow = _construct(parsed_file, yaml.constructor)
+            valid = _get_validator().is_valid(workflow)
+        except (ValueError, TypeError, YAMLError):
+            valid = False
+        if not valid:
+            throw_exception(EXCEPTIONS["GHA_COULD_NOT_PARSE"], path)
+            return None
 
         parsed_file_value = self.__parse_dict(parsed_file)
         if "name" not in parsed_file_value:
@@ -148,6 +196,7 @@ class GithubActionsParser(YamlParser):
                 type,
             )
         unit_block.path = path
+        unit_block.source = source
 
         for key, value in parsed_file.value:
             if key.value in ["env", "defaults"]:
@@ -162,13 +211,12 @@ class GithubActionsParser(YamlParser):
             elif key.value != "name":
                 unit_block.add_attribute(self.__parse_attribute(key, value, lines))
 
-        with open(path) as f:
-            comments = list(self._get_comments(parsed_file, f))
-            for comment in sorted(comments, key=lambda x: x[0]):
-                c = Comment(comment[1])
-                c.line = comment[0]
-                c.code = lines[c.line - 1]
-                unit_block.add_comment(c)
+        comments = list(self._get_comments(parsed_file, lines))
+        for comment in sorted(comments, key=lambda x: x[0]):
+            c = Comment(comment[1])
+            c.line = comment[0]
+            c.code = lines[c.line - 1]
+            unit_block.add_comment(c)
 
         return unit_block
 
@@ -1,12 +1,42 @@
 import os
+import threading
 from glitch.repr.inter import *
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from glitch.repr.inter import UnitBlockType
+from glitch.exclude import Excludes
+
+# Set in the threads (or processes) running calls of a parser's executor
+_local = threading.local()
+# Parser used by the calls in each process-pool worker (see init_parser_worker)
+_worker_parser: Optional["Parser"] = None
+
+
+def init_parser_worker(parser: "Parser") -> None:
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _call(parser: Optional["Parser"], method: str, args: Tuple[Any, ...]) -> Any:
+    if parser is None:
+        parser = _worker_parser
+    _local.worker = True
+    try:
+        return getattr(parser, method)(*args)
+    finally:
+        _local.worker = False
 
 
 class Parser(ABC):
+    # If set, the modules and files of a project are parsed concurrently by
+    # the executor and assembled in the same order as when parsed serially.
+    # Process pools must be initialized with init_parser_worker.
+    executor: Optional[Executor] = None
+    # Files and folders skipped while the folders are traversed
+    excludes: Excludes = Excludes()
+
     def parse(
         self, path: str, type: UnitBlockType, is_module: bool
     ) -> Optional[Module | Project | UnitBlock]:
@@ -29,8 +59,51 @@ class Parser(ABC):
     def parse_module(self, path: str) -> Module:
         pass
 
+    def get_module(self, path: str, root: str) -> Optional[str]:
+        """The folder of the module that parses the file in path when the
+        folder root is parsed as a project, or None if the file is not
+        parsed by a module."""
+        return None
+
+    @staticmethod
+    def _get_folders(path: str, root: str) -> List[str]:
+        """The folders below root, from the outermost one down to the one
+        that contains the file in path."""
+        folders: List[str] = []
+        relative = os.path.relpath(os.path.dirname(path), root)
+        if relative != ".":
+            for name in relative.split(os.sep):
+                root = os.path.join(root, name)
+                folders.append(root)
+        return folders
+
+    def _map(self, method: str, calls: List[Tuple[Any, ...]]) -> List[Any]:
+        """Calls the method of the parser with each of the arguments,
+        concurrently if the parser has an executor. The results are returned
+        in the same order."""
+        # The calls made by the executor's workers are serial, so that they
+        # never wait for the executor themselves
+        if self.executor is None or getattr(_local, "worker", False) or len(calls) < 2:
+            return [getattr(self, method)(*args) for args in calls]
+
+        parser = None if isinstance(self.executor, ProcessPoolExecutor) else self
+        futures = [self.executor.submit(_call, parser, method, a) for a in calls]
+        return [future.result() for future in futures]
+
+    def parse_modules(self, paths: List[str]) -> List[Module]:
+        """Parses each path as a module, concurrently if the parser has an
+        executor. The modules are returned in the same order."""
+        return self._map("parse_module", [(path,) for path in paths])
+
+    def parse_files(
+        self, files: List[Tuple[str, UnitBlockType]]
+    ) -> List[Optional[UnitBlock]]:
+        """Parses each path with its type, concurrently if the parser has an
+        executor. The unit blocks are returned in the same order."""
+        return self._map("parse_file", files)
+
     def parse_file_structure(self, folder: Folder, path: str) -> None:
-        for f in os.listdir(path):
+        for f in self.excludes.listdir(path):
             if os.path.islink(os.path.join(path, f)):
                 continue
             elif os.path.isfile(os.path.join(path, f)):
@@ -39,3 +112,9 @@ class Parser(ABC):
                 new_folder = Folder(f)
                 self.parse_file_structure(new_folder, os.path.join(path, f))
                 folder.add_folder(new_folder)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickled for the workers of a process pool, which parse serially
+        state = self.__dict__.copy()
+        state.pop("executor", None)
+        return state
@@ -8,7 +8,8 @@ from glitch.exceptions import EXCEPTIONS, throw_exception
 
 import glitch.parsers.parser as p
 from glitch.repr.inter import *
-from typing import List, Any, Dict, Callable
+from glitch.repr.source import Source
+from typing import List, Any, Dict, Callable, Optional, Tuple
 
 
 class PuppetParser(p.Parser):
@@ -744,15 +745,16 @@ class PuppetParser(p.Parser):
         res: Module = Module(os.path.basename(os.path.normpath(path)), path)
         super().parse_file_structure(res.folder, path)
 
-        for root, _, files in os.walk(path, topdown=False):
+        paths: List[Tuple[str, UnitBlockType]] = []
+        for root, _, files in self.excludes.walk(path, topdown=False):
             for name in files:
                 name_split = name.split(".")
                 if len(name_split) == 2 and name_split[-1] == "pp":
-                    block = self.parse_file(
-                        os.path.join(root, name), UnitBlockType.script
-                    )
-                    assert block is not None
-                    res.add_block(block)
+                    paths.append((os.path.join(root, name), UnitBlockType.script))
+
+        for block in self.parse_files(paths):
+            assert block is not None
+            res.add_block(block)
         return res
 
     def parse_file(self, path: str, type: UnitBlockType) -> UnitBlock | None:
@@ -760,23 +762,22 @@ class PuppetParser(p.Parser):
         unit_block.path = path
 
         try:
-            with open(path) as f:
-                parsed_script, comments = parse_puppet(f.read())
-
-                f.seek(0, 0)
-                code = f.readlines()
-
-                for c in comments:
-                    comment = Comment(c.content)
-                    comment.line = c.line
-                    comment.code = "".join(code[c.line - 1 : c.end_line])
-                    unit_block.add_comment(comment)
-
-                for ce in parsed_script:
-                    PuppetParser.__process_unitblock_component(
-                        PuppetParser.__process_codeelement(ce, path, code),
-                        unit_block,
-                    )
+            source = Source(path)
+            parsed_script, comments = parse_puppet(source.text)
+            code = source.lines
+
+            for c in comments:
+                comment = Comment(c.content)
+                comment.line = c.line
+                comment.code = "".join(code[c.line - 1 : c.end_line])
+                unit_block.add_comment(comment)
+
+            for ce in parsed_script:
+                PuppetParser.__process_unitblock_component(
+                    PuppetParser.__process_codeelement(ce, path, code),
+                    unit_block,
+                )
+            unit_block.set_source(source)
         except Exception:
             traceback.print_exc()
             throw_exception(EXCEPTIONS["PUPPET_COULD_NOT_PARSE"], path)
@@ -786,24 +787,33 @@ class PuppetParser(p.Parser):
     def parse_folder(self, path: str) -> Project:
         res: Project = Project(os.path.basename(os.path.normpath(path)))
 
-        if os.path.exists(f"{path}/modules") and not os.path.islink(f"{path}/modules"):
+        if (
+            os.path.exists(f"{path}/modules")
+            and not os.path.islink(f"{path}/modules")
+            and not self.excludes.excluded(f"{path}/modules", True)
+        ):
             subfolders = [
                 f.path
-                for f in os.scandir(f"{path}/modules")
+                for f in self.excludes.scandir(f"{path}/modules")
                 if f.is_dir() and not f.is_symlink()
             ]
-            for m in subfolders:
-                res.add_module(self.parse_module(m))
+            for module in self.parse_modules(subfolders):
+                res.add_module(module)
 
-        for f in os.scandir(path):
+        paths: List[Tuple[str, UnitBlockType]] = []
+        for f in self.excludes.scandir(path):
             name_split = f.name.split(".")
             if f.is_file() and len(name_split) == 2 and name_split[-1] == "pp":
-                block = self.parse_file(f.path, UnitBlockType.script)
-                assert block is not None
-                res.add_block(block)
+                paths.append((f.path, UnitBlockType.script))
+
+        for block in self.parse_files(paths):
+            assert block is not None
+            res.add_block(block)
 
         subfolders = [
-            f.path for f in os.scandir(f"{path}") if f.is_dir() and not f.is_symlink()
+            f.path
+            for f in self.excludes.scandir(f"{path}")
+            if f.is_dir() and not f.is_symlink()
         ]
         for d in subfolders:
             if os.path.basename(os.path.normpath(d)) not in ["modules"]:
@@ -812,3 +822,10 @@ class PuppetParser(p.Parser):
                 res.modules += aux.modules
 
         return res
+
+    def get_module(self, path: str, root: str) -> Optional[str]:
+        folders = self._get_folders(path, root)
+        for i, folder in enumerate(folders[:-1]):
+            if os.path.basename(folder) == "modules":
+                return folders[i + 1]
+        return None
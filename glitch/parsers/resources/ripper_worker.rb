@@ -0,0 +1,41 @@
+require 'ripper'
+require 'pp'
+
+# Long-lived worker used by the Chef parser. It reads one path per line from
+# stdin and answers each one with a frame with the comments of the file
+# followed by its raw s-expression:
+#   <ok|error> <size of the payload in bytes>\n<payload>
+
+class CommentRipper < Ripper::SexpBuilder
+    attr_reader :comments
+
+    def initialize(src)
+        super(src)
+        @comments = []
+    end
+
+    def on_comment(token)
+        super.tap { |result| @comments << result }
+    end
+end
+
+$stdin.binmode
+$stdout.binmode
+
+while (line = $stdin.gets)
+    path = line.chomp
+    begin
+        ripper = CommentRipper.new(File.read(path))
+        sexp = ripper.parse
+        # Same as Ripper.sexp_raw, which gives nil for files with errors
+        sexp = nil if ripper.error?
+        status = "ok"
+        payload = ripper.comments.map(&:pretty_inspect).join + sexp.pretty_inspect
+    rescue StandardError => e
+        status = "error"
+        payload = e.message
+    end
+    payload = payload.b
+    $stdout.write("#{status} #{payload.bytesize}\n", payload)
+    $stdout.flush
+end
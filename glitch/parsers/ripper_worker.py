@@ -0,0 +1,109 @@
+import atexit
+import threading
+import subprocess
+
+from importlib.resources import files
+from typing import IO, List, Optional
+
+
+class RipperError(Exception):
+    pass
+
+
+class RipperWorker:
+    """A long-lived Ruby process that parses files with Ripper, so that the
+    interpreter is only started once instead of once per file."""
+
+    def __init__(self) -> None:
+        script = files("glitch.parsers").joinpath("resources/ripper_worker.rb")
+        self.process = subprocess.Popen(
+            ["ruby", str(script)], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        self.stdin: IO[bytes] = self.process.stdin  # type: ignore
+        self.stdout: IO[bytes] = self.process.stdout  # type: ignore
+
+    def parse(self, path: str) -> str:
+        """Returns the comments of the file, as printed by pp, followed by
+        the output of Ripper.sexp_raw."""
+        self.stdin.write(path.encode("utf-8") + b"\n")
+        self.stdin.flush()
+
+        header = self.stdout.readline().split()
+        if len(header) != 2:
+            raise OSError(f"Ripper worker exited unexpectedly while parsing {path}")
+        status, size = header
+        payload = self.stdout.read(int(size)).decode("utf-8", errors="replace")
+
+        if status != b"ok":
+            raise RipperError(payload)
+        return payload
+
+    def close(self) -> None:
+        try:
+            self.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+class RipperPool:
+    """Pool of Ripper workers shared by the threads of the process. A new
+    worker is only started when all the others are busy."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__idle: List[RipperWorker] = []
+        self.__workers: List[RipperWorker] = []
+        atexit.register(self.close)
+
+    def __acquire(self) -> RipperWorker:
+        with self.__lock:
+            if len(self.__idle) > 0:
+                return self.__idle.pop()
+
+        worker = RipperWorker()
+        with self.__lock:
+            self.__workers.append(worker)
+        return worker
+
+    def __release(self, worker: RipperWorker) -> None:
+        with self.__lock:
+            self.__idle.append(worker)
+
+    def __discard(self, worker: RipperWorker) -> None:
+        worker.close()
+        with self.__lock:
+            self.__workers.remove(worker)
+
+    def parse(self, path: str) -> str:
+        worker = self.__acquire()
+        try:
+            result = worker.parse(path)
+        except RipperError:
+            # The file could not be parsed, but the worker is still usable
+            self.__release(worker)
+            raise
+        except:
+            self.__discard(worker)
+            raise
+
+        self.__release(worker)
+        return result
+
+    def close(self) -> None:
+        with self.__lock:
+            workers, self.__workers, self.__idle = self.__workers, [], []
+        for worker in workers:
+            worker.close()
+
+
+_pool: Optional[RipperPool] = None
+_pool_lock = threading.Lock()
+
+
+def ripper_sexp(path: str) -> str:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RipperPool()
+    return _pool.parse(path)
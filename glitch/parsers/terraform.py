@@ -1,12 +1,16 @@
 # type: ignore (#TODO)
 import os
+import threading
+from functools import lru_cache
 from hcl2.parser import hcl2
 import glitch.parsers.parser as p
 
 from glitch.exceptions import EXCEPTIONS, throw_exception
 from glitch.repr.inter import *
-from typing import List, Any
+from glitch.repr.source import Source
+from typing import List, Any, Optional, Tuple
 
+from lark import Lark
 from lark.tree import Meta, Tree
 from lark.lexer import Token
 from lark.visitors import Transformer, v_args, Discard
@@ -369,24 +373,102 @@ class GLITCHTransformer(Transformer):
         return args[0]
 
 
+class _PendingTree(Tree):
+    """A rule reduced by the inline parser. It is transformed when its
+    parent is reduced, since its meta is only set after its callback."""
+
+    def transform(self, transformer: GLITCHTransformer) -> Any:
+        return transformer._call_userfunc(self, self.children)
+
+
+class InlineTransformer:
+    """Applies the GLITCHTransformer while the file is parsed (through the
+    transformer option of lark), so the parse tree of the whole file is
+    never built.
+
+    Lark only sets the meta of a rule, which spans all of its tokens (even
+    the filtered ones), after the callback of the rule returns. Each rule is
+    therefore transformed when its parent is reduced, with the same children
+    and meta as in the tree. Only the comments can be found in a different
+    order, so they are sorted by position. A single parser is shared by all
+    the files, so the GLITCHTransformer of each file is kept per thread."""
+
+    def __init__(self) -> None:
+        self.__local = threading.local()
+
+    def __default__(self, data: str, children: List, meta: Any) -> Tree:
+        # Called by lark for every rule, since no other callback is defined
+        if data.startswith("_"):
+            # Inlined in the parent by lark, which transforms the children
+            # (e.g. the items of a list are only iterated once)
+            return _PendingTree(data, children)
+
+        transformer = self.__local.transformer
+        args = []
+        for child in children:
+            if isinstance(child, _PendingTree):
+                child = child.transform(transformer)
+                if child is Discard:
+                    continue
+            args.append(child)
+        return _PendingTree(data, args)
+
+    def transform_text(
+        self, parser: Lark, text: str, code: List[str]
+    ) -> Tuple[List, List[Comment]]:
+        transformer = GLITCHTransformer(code)
+        self.__local.transformer = transformer
+        try:
+            elements = parser.parse(text)
+            if isinstance(elements, _PendingTree):
+                elements = elements.transform(transformer)
+        finally:
+            self.__local.transformer = None
+
+        comments = sorted(transformer.comments, key=lambda c: (c.line, c.column))
+        return elements, comments
+
+
+@lru_cache(maxsize=None)
+def _get_inline_parser() -> Tuple[Lark, InlineTransformer]:
+    # Built from the grammar and options of python-hcl2, and serialized to
+    # lark's cache so that it is only built once
+    transformer = InlineTransformer()
+    options = {**hcl2.options.options, "transformer": transformer, "cache": True}
+    options.pop("source_path", None)
+    return Lark(hcl2.source_grammar, **options), transformer
+
+
 class TerraformParser(p.Parser):
+    def __init__(self, inline: bool = True) -> None:
+        super().__init__()
+        # If set, the files are transformed while they are parsed instead of
+        # building their parse tree first (see InlineTransformer)
+        self.inline = inline
+
+    def __transform(self, source: Source) -> Tuple[List, List[Comment]]:
+        if self.inline:
+            parser, transformer = _get_inline_parser()
+            return transformer.transform_text(parser, source.text + "\n", source.lines)
+
+        tree = hcl2.parse(source.text + "\n")
+        transformer = GLITCHTransformer(source.lines)
+        return transformer.transform(tree), transformer.comments
+
     def parse_file(self, path: str, type: UnitBlockType) -> UnitBlock:
         unit_block = UnitBlock(path, type)
         unit_block.path = path
         try:
-            with open(path) as f:
-                tree = hcl2.parse(f.read() + "\n")
-                f.seek(0, 0)
-                code = f.readlines()
-                transformer = GLITCHTransformer(code)
-                elements = transformer.transform(tree)
-                for el in elements:
-                    if isinstance(el, AtomicUnit):
-                        unit_block.add_atomic_unit(el)
-                    elif isinstance(el, UnitBlock):
-                        unit_block.add_unit_block(el)
-                for c in transformer.comments:
-                    unit_block.add_comment(c)
+            source = Source(path)
+            elements, comments = self.__transform(source)
+            for el in elements:
+                if isinstance(el, AtomicUnit):
+                    unit_block.add_atomic_unit(el)
+                elif isinstance(el, UnitBlock):
+                    unit_block.add_unit_block(el)
+            for c in comments:
+                unit_block.add_comment(c)
+            unit_block.set_source(source)
         except:
             throw_exception(EXCEPTIONS["TERRAFORM_COULD_NOT_PARSE"], path)
             return None
@@ -398,24 +480,30 @@ class TerraformParser(p.Parser):
         super().parse_file_structure(res.folder, path)
 
         files = [
-            f.path for f in os.scandir(f"{path}") if f.is_file() and not f.is_symlink()
+            f.path
+            for f in self.excludes.scandir(f"{path}")
+            if f.is_file() and not f.is_symlink()
         ]
-        for f in files:
-            unit_block = self.parse_file(f, UnitBlockType.unknown)
+        for unit_block in self.parse_files([(f, UnitBlockType.unknown) for f in files]):
             res.add_block(unit_block)
 
         return res
 
     def parse_folder(self, path: str) -> Project:
         res: Project = Project(os.path.basename(os.path.normpath(path)))
-        res.add_module(self.parse_module(path))
-
-        subfolders = [
-            f.path for f in os.scandir(f"{path}") if f.is_dir() and not f.is_symlink()
-        ]
-        for d in subfolders:
-            aux = self.parse_folder(d)
-            res.blocks += aux.blocks
-            res.modules += aux.modules
-
+        for module in self.parse_modules(self.__get_folders(path)):
+            res.add_module(module)
         return res
+
+    def get_module(self, path: str, root: str) -> Optional[str]:
+        # Every folder is parsed as a module
+        return os.path.dirname(path)
+
+    def __get_folders(self, path: str) -> List[str]:
+        """The folder and all of its subfolders that are not excluded, in
+        depth-first order. Each one is parsed as a module."""
+        folders = [path]
+        for f in self.excludes.scandir(f"{path}"):
+            if f.is_dir() and not f.is_symlink():
+                folders += self.__get_folders(f.path)
+        return folders
@@ -2,22 +2,55 @@ import jinja2
 import jinja2.nodes
 import glitch.parsers.parser as p
 
-from typing import List, Tuple, TextIO, Union, Any
+from typing import List, Tuple, Union, Any
 from ruamel.yaml.nodes import Node, MappingNode, SequenceNode, ScalarNode
 from ruamel.yaml.tokens import Token, CommentToken
 from jinja2 import Environment
 from abc import ABC
-from copy import deepcopy
+from copy import copy, deepcopy
+from functools import lru_cache
 
 from glitch.repr.inter import *
 
 
 RecursiveTokenList = List[Union[Token, "RecursiveTokenList", None]]
 
+# Number of distinct templates whose Jinja nodes are kept by each parser
+TEMPLATE_CACHE_SIZE = 4096
+
 
 class YamlParser(p.Parser, ABC):
     def __init__(self, options: dict[str, Any] = {}):
-        self.env = Environment(**options)
+        self.options = options
+        self.__init_env()
+
+    def __init_env(self) -> None:
+        self.env = Environment(**self.options)
+        # The same templates (e.g. "{{ item }}") appear over and over, and
+        # their nodes are only read while converted to the IR
+        self.__parse_template = lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(self.env.parse)
+        self.__delimiters = [
+            d
+            for d in (
+                self.env.block_start_string,
+                self.env.variable_start_string,
+                self.env.comment_start_string,
+                self.env.line_statement_prefix,
+                self.env.line_comment_prefix,
+            )
+            if d is not None
+        ]
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The environment and its cache are built again when unpickled
+        state = super().__getstate__()
+        for name in ("env", "_YamlParser__parse_template", "_YamlParser__delimiters"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__init_env()
 
     def _get_code(
         self,
@@ -50,12 +83,12 @@ class YamlParser(p.Parser, ABC):
 
         return res
 
-    def _get_comments(self, d: Node, file: TextIO) -> set[Tuple[int, str]]:
+    def _get_comments(self, d: Node, f_lines: List[str]) -> set[Tuple[int, str]]:
         """Extracts comments from a YAML file and returns a set of tuples with the line number and the comment itself.
 
         Args:
             d (Node): The root node of the YAML file.
-            file (TextIO): The file object of the YAML file.
+            f_lines (List[str]): The lines of the YAML file.
 
         Returns:
             set[Tuple[int, str]]: A set of tuples with the line number and the comment itself.
@@ -95,9 +128,6 @@ class YamlParser(p.Parser, ABC):
 
             return res
 
-        file.seek(0, 0)
-        f_lines = file.readlines()
-
         comments: List[Tuple[int, str]] = []
         for c_group in yaml_comments(d):
             line = c_group[0]
@@ -158,7 +188,7 @@ class YamlParser(p.Parser, ABC):
     def __parse_jinja_node(
         self, node: jinja2.nodes.Node, base_info: ElementInfo
     ) -> Expr:
-        info = deepcopy(base_info)
+        info = copy(base_info)
         code = base_info.code.split("\n")
 
         # The lineno and col of the filter start
@@ -334,6 +364,16 @@ class YamlParser(p.Parser, ABC):
         else:
             raise ValueError(f"Node not supported {node}")
 
+    def __is_text(self, v: str) -> bool:
+        """True if Jinja would parse the string as a single TemplateData with
+        the same content (newlines are normalized and a trailing one removed)."""
+        return (
+            v.strip() not in ["", "'", '"']
+            and "\r" not in v
+            and not v.endswith("\n")
+            and not any(d in v for d in self.__delimiters)
+        )
+
     def __parse_string(self, v: str, info: ElementInfo) -> Expr:
         """
         Parses a string to the intermediate representation and unrolls
@@ -343,11 +383,19 @@ class YamlParser(p.Parser, ABC):
             return Null(info)
         quotes = v.startswith(("'", '"')) and v.endswith(("'", '"'))
 
-        body = self.env.parse(v).body
-        if len(body) == 0:
-            return String(v, info)
+        if self.__is_text(v):
+            # Jinja would return the text as a single TemplateData node
+            data = jinja2.nodes.TemplateData(v, lineno=1)
+            data.col = 0
+            data.end_lineno = v.count("\n") + 1
+            data.end_col = len(v) - v.rfind("\n") - 1
+            jinja_nodes: List[jinja2.nodes.Node] = [data]
+        else:
+            body = self.__parse_template(v).body
+            if len(body) == 0:
+                return String(v, info)
 
-        jinja_nodes = list(body[0].iter_child_nodes())
+            jinja_nodes = list(body[0].iter_child_nodes())
 
         for node in jinja_nodes[::-1]:
             if isinstance(node, jinja2.nodes.TemplateData) and node.data.strip() in [
@@ -2,26 +2,104 @@ import json
 import os
 
 from typing import List, Dict, Any, Optional, cast
-from glitch.rego.rego_python.src.rego_python import run_rego
+from glitch.rego.rego_python.src.rego_python import (
+    prepare_rego,
+    eval_prepared,
+    eval_prepared_batch,
+    free_prepared,
+)
 from glitch.repr.inter import *
 from glitch.analysis.rules import Error
 
+# Keyword lists of the security section that the Rego queries match as regexes
+KEYWORD_LISTS = (
+    "passwords",
+    "secrets",
+    "misc_secrets",
+    "users",
+    "roles",
+    "admin",
+    "suspicious_words",
+    "weak_crypt",
+    "weak_crypt_whitelist",
+    "download_extensions",
+    "checksum",
+)
+# Matches nothing, used for empty lists (no position is both a word boundary
+# and not a word boundary)
+NO_KEYWORDS = "(?:\\b\\B)"
+
+
+def keyword_patterns(config: Dict[str, Dict[str, List[str]]]) -> Dict[str, str]:
+    """Combines each keyword list into a single alternation, available to the
+    Rego queries as data.keywords. A name or value is then matched against
+    all the keywords of a list with one regex, instead of one per keyword."""
+    patterns: Dict[str, str] = {}
+    security = config.get("security", {})
+    for name in KEYWORD_LISTS:
+        keywords = security.get(name)
+        if not isinstance(keywords, list):
+            continue
+        if len(keywords) == 0:
+            patterns[name] = NO_KEYWORDS
+        else:
+            patterns[name] = "(?:" + "|".join(keywords) + ")"
+    return patterns
+
 
-def run_analyses(
-    input: str,
+def prepare_analyses(
     config: Dict[str, Dict[str, List[str]]],
     rego_modules: Dict[str, str],
-) -> List[Error]:
-    input_data = json.loads(input)
+) -> Optional[int]:
+    """Compiles the Rego modules once so that they can be evaluated for every
+    analyzed file with run_analyses. Returns None if there are no modules."""
+    if not rego_modules:
+        return None
 
-    data: Dict[str, Any] = config
+    data: Dict[str, Any] = {**config, "keywords": keyword_patterns(config)}
+    return prepare_rego(data, rego_modules)
 
-    if not rego_modules:
+
+def free_analyses(rego_query: Optional[int]) -> None:
+    if rego_query is not None:
+        free_prepared(rego_query)
+
+
+def encode_input(inter: Project | Module | UnitBlock) -> bytes:
+    """Encodes the IR as the input of the Rego analyses. The JSON is compact
+    and passed as is to the Rego engine."""
+    return json.dumps(inter.as_dict(), separators=(",", ":")).encode("utf-8")
+
+
+def run_analyses(input: bytes, rego_query: Optional[int]) -> List[Error]:
+    if rego_query is None:
         # No modules to run, return empty errors
         return []
 
-    result = run_rego(input_data, data, rego_modules)
+    result = eval_prepared(rego_query, input)
+
+    return errors_from_result(result)
+
+
+def run_analyses_batch(
+    inputs: List[bytes], rego_query: Optional[int]
+) -> List[List[Error]]:
+    """Evaluates the inputs of several files in a single call to the Rego
+    engine, which evaluates them concurrently. Returns the errors of each
+    input, in the same order as the inputs."""
+    if rego_query is None or len(inputs) == 0:
+        return [[] for _ in inputs]
+
+    results = eval_prepared_batch(rego_query, inputs)
+
+    if isinstance(results, dict) and "error" in results:
+        print("Error:", results["error"])  # type: ignore
+        return [[] for _ in inputs]
+
+    return [errors_from_result(result) for result in results]
+
 
+def errors_from_result(result: Any) -> List[Error]:
     if result is None:
         # Nothing to process
         return []
@@ -107,7 +107,12 @@ has_variable_reference(node) {
 
 # Check if a string contains a substring
 contains(str, substr) {
-    regex.match(sprintf("(?i).*%s.*", [substr]), str)
+    regex.match(contains_pattern(substr), str)
+}
+
+# Pattern used by contains, e.g. to traverse a node with a keyword pattern
+contains_pattern(substr) = pattern {
+    pattern := sprintf("(?i).*%s.*", [substr])
 }
 
 is_ir_type_in(value, allowed) {
@@ -4,16 +4,15 @@ import data.glitch_lib
 
 check_def_admin_pair(name, value) {
 	# Check if the name of the node matches any of the roles or users defined in security
-	combined := array.concat(data.security.roles, data.security.users)
-	element := combined[_]
-	pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [element])
+	combined := sprintf("(?:%s|%s)", [data.keywords.roles, data.keywords.users])
+	pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [combined])
 	regex.match(pattern, name)
 
 	# Check if there is not a VariableReference object
 	glitch_lib.traverse_var(value)
 
     # Check if it is a admin user
-	glitch_lib.traverse(value, data.security.admin)
+	glitch_lib.traverse(value, glitch_lib.contains_pattern(data.keywords.admin))
 }
 
 Glitch_Analysis[result] {
@@ -32,10 +32,7 @@ checking_value(value) {
 } 
 
 check_pair_empty_password(name, value) {
-	hardcoded := data.security.passwords
-
-	item := hardcoded[_]
-	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [item])
+	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [data.keywords.passwords])
 	
 	regex.match(hard_coded_pattern, name)
 
@@ -8,10 +8,7 @@ whitelist_contains(name) {
 }
 
 check_pair_hard_password(name, value) {
-	hardcoded := data.security.passwords
-
-	item := hardcoded[_]
-	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [item])
+	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [data.keywords.passwords])
 	
 	regex.match(hard_coded_pattern, lower(name))
 
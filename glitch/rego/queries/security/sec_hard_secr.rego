@@ -22,10 +22,7 @@ flatten_name(name) = flat_name {
 }
 
 check_pair_hard_secr(name, value) {
-	hardcoded := data.security.secrets
-
-	item := hardcoded[_]
-	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [item])
+	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [data.keywords.secrets])
 	
 	regex.match(hard_coded_pattern, lower(name))
 
@@ -52,7 +49,7 @@ check_pair_hard_secr(name, value) {
 	not glitch_lib.contains(lower(secret_value), "password")
 
 } else {
-    item := data.security.misc_secrets[_]
+    item := data.keywords.misc_secrets
     flat_name := flatten_name(name)
     
     pattern := sprintf(
@@ -9,10 +9,7 @@ whitelist_contains(name) {
 
 
 check_pair_hard_users(name, value) {
-	hardcoded := data.security.users
-
-	item := hardcoded[_]
-	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [item])
+	hard_coded_pattern := sprintf("[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b", [data.keywords.users])
 	
 	regex.match(hard_coded_pattern, lower(name))
 
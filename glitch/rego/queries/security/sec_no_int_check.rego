@@ -2,9 +2,8 @@ package glitch
 
 import data.glitch_lib
 
-attr_has_any_checksum(attr, checksum_values) {
-    check := checksum_values[_]
-    pattern := sprintf("(?i).*%s.*", [check])
+attr_has_any_checksum(attr) {
+    pattern := glitch_lib.contains_pattern(data.keywords.checksum)
     # We use traverse so it can find all strings and test them inside
     glitch_lib.traverse(attr, pattern)
 }
@@ -14,16 +13,14 @@ check_integrity_check_atomic_unit(node) {
     
     attr = attributes[_]
     
-    download = data.security.download_extensions[_]
+    download = data.keywords.download_extensions
     
     # We use code, since it can be a SUM atribute
     regex.match(sprintf("(http|https|www)[^ ,]*\\.%s", [download]), attr.code)
     
-    checksum_values = data.security.checksum
-    
     attributes_without_checksum := {attr |
         attr := attributes[_]
-        not attr_has_any_checksum(attr, checksum_values)
+        not attr_has_any_checksum(attr)
     }
 
     # Trigger integrity check only if ALL attributes lack a checksum keyword
@@ -31,13 +28,13 @@ check_integrity_check_atomic_unit(node) {
 }
 
 check_integrity_check_keyvalues(node) {
-    value = data.security.checksum[_]
+    value = data.keywords.checksum
     glitch_lib.contains(node.name, value)
     false_pattern = "^(?i)(no|false)$"
     glitch_lib.traverse(node, false_pattern)
 } else {
     # This case is repeated since for puppet it becames a boolean and ansible a string
-    value = data.security.checksum[_]
+    value = data.keywords.checksum
     glitch_lib.contains(node.name, value)
     glitch_lib.traverse(node, false)
 }
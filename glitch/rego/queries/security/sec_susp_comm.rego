@@ -9,8 +9,7 @@ check_susp_comment(comment) {
 
 	lower_line := lower(line)
 
-	element := data.security.suspicious_words[_]
-	pattern := sprintf(".*%s.*", [element])
+	pattern := sprintf(".*%s.*", [data.keywords.suspicious_words])
 	
     regex.match(pattern, lower_line)
 } 
@@ -3,12 +3,12 @@ package glitch
 import data.glitch_lib
 
 name_in_whitelist(name) {
-    glitch_lib.contains(name, data.security.weak_crypt_whitelist[_])
+    glitch_lib.contains(name, data.keywords.weak_crypt_whitelist)
 }
 
 check_weak_crypt(value, name) {
-    glitch_lib.traverse(value, data.security.weak_crypt)
-    not glitch_lib.traverse(value, data.security.weak_crypt_whitelist)
+    glitch_lib.traverse(value, glitch_lib.contains_pattern(data.keywords.weak_crypt))
+    not glitch_lib.traverse(value, glitch_lib.contains_pattern(data.keywords.weak_crypt_whitelist))
     not name_in_whitelist(name)
 }
 
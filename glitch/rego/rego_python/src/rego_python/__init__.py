@@ -1,3 +1,19 @@
-from .wrapper import run_rego, is_rego_available, get_rego_error
+from .wrapper import (
+    run_rego,
+    prepare_rego,
+    eval_prepared,
+    eval_prepared_batch,
+    free_prepared,
+    is_rego_available,
+    get_rego_error,
+)
 
-__all__ = ["run_rego", "is_rego_available", "get_rego_error"]
+__all__ = [
+    "run_rego",
+    "prepare_rego",
+    "eval_prepared",
+    "eval_prepared_batch",
+    "free_prepared",
+    "is_rego_available",
+    "get_rego_error",
+]
@@ -2,6 +2,7 @@ package main
 
 /*
 #include <stdlib.h>
+#include <string.h>
 */
 import "C"
 
@@ -9,12 +10,68 @@ import (
 	"context"
 	"encoding/json"
 	"fmt"
+	"runtime"
+	"sync"
 	"unsafe"
 
 	"github.com/open-policy-agent/opa/rego"
 	"github.com/open-policy-agent/opa/storage/inmem"
 )
 
+const query = "data.glitch.Glitch_Analysis"
+
+// Queries compiled by PrepareRego, indexed by the handle returned to the caller.
+// A PreparedEvalQuery can be evaluated concurrently, so the lock only guards the map.
+var (
+	preparedMutex   sync.RWMutex
+	preparedQueries       = map[int64]*rego.PreparedEvalQuery{}
+	nextHandle      int64 = 1
+)
+
+func regoArgs(data string, modules string) ([]func(*rego.Rego), error) {
+	var dataVal map[string]interface{}
+	var moduleMap map[string]string
+
+	if err := json.Unmarshal([]byte(data), &dataVal); err != nil {
+		return nil, fmt.Errorf("failed to parse data: %s", err)
+	}
+
+	if err := json.Unmarshal([]byte(modules), &moduleMap); err != nil {
+		return nil, fmt.Errorf("failed to parse modules: %s", err)
+	}
+	store := inmem.NewFromObject(dataVal)
+
+	args := []func(*rego.Rego){}
+	args = append(args, rego.Query(query))
+	args = append(args, rego.Store(store))
+
+	for name, code := range moduleMap {
+		args = append(args, rego.Module(name, code))
+	}
+
+	return args, nil
+}
+
+// cBytes copies a C string into a byte slice, without the intermediate Go
+// string that C.GoString would create.
+func cBytes(str *C.char) []byte {
+	return C.GoBytes(unsafe.Pointer(str), C.int(C.strlen(str)))
+}
+
+func errorString(message string) *C.char {
+	out, _ := json.Marshal(map[string]string{"error": message})
+	return C.CString(string(out))
+}
+
+func resultString(results rego.ResultSet) *C.char {
+	out, err := json.Marshal(results)
+	if err != nil {
+		return errorString(fmt.Sprintf("output serialization failed: %s", err))
+	}
+
+	return C.CString(string(out))
+}
+
 //export RunRego
 func RunRego(inputJSON *C.char, dataJSON *C.char, modulesJSON *C.char) *C.char {
 	input := C.GoString(inputJSON)
@@ -22,51 +79,147 @@ func RunRego(inputJSON *C.char, dataJSON *C.char, modulesJSON *C.char) *C.char {
 	modules := C.GoString(modulesJSON)
 
 	var inputVal interface{}
-	var dataVal map[string]interface{}
-	var moduleMap map[string]string
-
 	if err := json.Unmarshal([]byte(input), &inputVal); err != nil {
-		return C.CString(fmt.Sprintf(`{"error": "failed to parse input: %s"}`, err))
+		return errorString(fmt.Sprintf("failed to parse input: %s", err))
 	}
 
-	if err := json.Unmarshal([]byte(data), &dataVal); err != nil {
-		return C.CString(fmt.Sprintf(`{"error": "failed to parse data: %s"}`, err))
+	args, err := regoArgs(data, modules)
+	if err != nil {
+		return errorString(err.Error())
 	}
+	args = append(args, rego.Input(inputVal))
 
-	if err := json.Unmarshal([]byte(modules), &moduleMap); err != nil {
-        return C.CString(fmt.Sprintf(`{"error": "failed to parse modules: %s"}`, err))
-    }
-    store := inmem.NewFromObject(dataVal)
+	r := rego.New(args...)
+
+	ctx := context.Background()
+	results, err := r.Eval(ctx)
 
-    regoArgs := []func(*rego.Rego){}
-    regoArgs = append(regoArgs, rego.Query("data.glitch.Glitch_Analysis"))
-    regoArgs = append(regoArgs, rego.Input(inputVal))
-    regoArgs = append(regoArgs, rego.Store(store))
+	if err != nil {
+		return errorString(fmt.Sprintf("rego evaluation failed: %s", err))
+	}
 
-    for name, code := range moduleMap {
-        regoArgs = append(regoArgs, rego.Module(name, code))
-    }
+	return resultString(results)
+}
 
-    r := rego.New(regoArgs...)
+// PrepareRego compiles the modules once against the given data and returns
+// {"handle": n}, which can then be evaluated any number of times with EvalPrepared.
+//
+//export PrepareRego
+func PrepareRego(dataJSON *C.char, modulesJSON *C.char) *C.char {
+	data := C.GoString(dataJSON)
+	modules := C.GoString(modulesJSON)
+
+	args, err := regoArgs(data, modules)
+	if err != nil {
+		return errorString(err.Error())
+	}
 
 	ctx := context.Background()
-	results, err := r.Eval(ctx)
+	prepared, err := rego.New(args...).PrepareForEval(ctx)
+	if err != nil {
+		return errorString(fmt.Sprintf("rego preparation failed: %s", err))
+	}
+
+	preparedMutex.Lock()
+	handle := nextHandle
+	nextHandle++
+	preparedQueries[handle] = &prepared
+	preparedMutex.Unlock()
+
+	out, _ := json.Marshal(map[string]int64{"handle": handle})
+	return C.CString(string(out))
+}
+
+//export EvalPrepared
+func EvalPrepared(handle C.longlong, inputJSON *C.char) *C.char {
+	preparedMutex.RLock()
+	prepared, ok := preparedQueries[int64(handle)]
+	preparedMutex.RUnlock()
 
+	if !ok {
+		return errorString(fmt.Sprintf("unknown prepared query handle: %d", int64(handle)))
+	}
+
+	var inputVal interface{}
+	if err := json.Unmarshal(cBytes(inputJSON), &inputVal); err != nil {
+		return errorString(fmt.Sprintf("failed to parse input: %s", err))
+	}
+
+	ctx := context.Background()
+	results, err := prepared.Eval(ctx, rego.EvalInput(inputVal))
 	if err != nil {
-		return C.CString(fmt.Sprintf(`{"error": "rego evaluation failed: %s"}`, err))
+		return errorString(fmt.Sprintf("rego evaluation failed: %s", err))
+	}
+
+	return resultString(results)
+}
+
+// EvalPreparedBatch evaluates a JSON array of inputs against a prepared query.
+// The inputs are evaluated concurrently and the result is a JSON array with
+// one entry per input, in the same order. An entry is either the result set
+// of the evaluation or {"error": ...} if that input could not be evaluated.
+//
+//export EvalPreparedBatch
+func EvalPreparedBatch(handle C.longlong, inputsJSON *C.char) *C.char {
+	preparedMutex.RLock()
+	prepared, ok := preparedQueries[int64(handle)]
+	preparedMutex.RUnlock()
+
+	if !ok {
+		return errorString(fmt.Sprintf("unknown prepared query handle: %d", int64(handle)))
+	}
+
+	var inputVals []json.RawMessage
+	if err := json.Unmarshal(cBytes(inputsJSON), &inputVals); err != nil {
+		return errorString(fmt.Sprintf("failed to parse inputs: %s", err))
 	}
 
+	results := make([]interface{}, len(inputVals))
+	ctx := context.Background()
+
+	var wg sync.WaitGroup
+	slots := make(chan struct{}, runtime.GOMAXPROCS(0))
+	for i, raw := range inputVals {
+		wg.Add(1)
+		slots <- struct{}{}
+		go func(i int, raw json.RawMessage) {
+			defer wg.Done()
+			defer func() { <-slots }()
+
+			var inputVal interface{}
+			if err := json.Unmarshal(raw, &inputVal); err != nil {
+				results[i] = map[string]string{"error": fmt.Sprintf("failed to parse input: %s", err)}
+				return
+			}
+
+			rs, err := prepared.Eval(ctx, rego.EvalInput(inputVal))
+			if err != nil {
+				results[i] = map[string]string{"error": fmt.Sprintf("rego evaluation failed: %s", err)}
+				return
+			}
+			results[i] = rs
+		}(i, raw)
+	}
+	wg.Wait()
+
 	out, err := json.Marshal(results)
 	if err != nil {
-		return C.CString(fmt.Sprintf(`{"error": "output serialization failed: %s"}`, err))
+		return errorString(fmt.Sprintf("output serialization failed: %s", err))
 	}
 
 	return C.CString(string(out))
 }
 
+//export FreePrepared
+func FreePrepared(handle C.longlong) {
+	preparedMutex.Lock()
+	delete(preparedQueries, int64(handle))
+	preparedMutex.Unlock()
+}
+
 //export FreeCString
 func FreeCString(str *C.char) {
-    C.free(unsafe.Pointer(str))
+	C.free(unsafe.Pointer(str))
 }
 
 func main() {}
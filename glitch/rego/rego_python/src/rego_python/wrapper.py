@@ -49,6 +49,14 @@ def _load_lib() -> Any:
         _lib = ctypes.CDLL(str(lib_path))
         _lib.RunRego.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p]
         _lib.RunRego.restype = ctypes.c_void_p
+        _lib.PrepareRego.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
+        _lib.PrepareRego.restype = ctypes.c_void_p
+        _lib.EvalPrepared.argtypes = [ctypes.c_longlong, ctypes.c_char_p]
+        _lib.EvalPrepared.restype = ctypes.c_void_p
+        _lib.EvalPreparedBatch.argtypes = [ctypes.c_longlong, ctypes.c_char_p]
+        _lib.EvalPreparedBatch.restype = ctypes.c_void_p
+        _lib.FreePrepared.argtypes = [ctypes.c_longlong]
+        _lib.FreePrepared.restype = None
         _lib.FreeCString.argtypes = [ctypes.c_void_p]
         _lib.FreeCString.restype = None
         _rego_available = True
@@ -56,6 +64,11 @@ def _load_lib() -> Any:
     except OSError as e:
         _rego_error = str(e)
         return None
+    except AttributeError as e:
+        # Binaries built before the prepared query API was added
+        _rego_error = f"Rego library is outdated, please rebuild it: {e}"
+        _lib = None
+        return None
 
 
 _load_lib()
@@ -85,7 +98,72 @@ def run_rego(
         rego_modules_str.encode("utf-8"),
     )
 
-    result_json = ctypes.string_at(result_ptr).decode("utf-8")
+    return _read_result(result_ptr)
+
+
+def prepare_rego(data: dict[str, str], rego_modules: dict[str, str]) -> int:
+    """Compiles the Rego modules once and returns a handle to the prepared query.
+
+    The handle can be evaluated with eval_prepared any number of times and,
+    when it is no longer needed, released with free_prepared.
+    """
+    if _lib is None:
+        raise RuntimeError(f"Rego library is not available: {_rego_error}")
+
+    data_str = json.dumps(data)
+    rego_modules_str = json.dumps(rego_modules)
+
+    result_ptr = _lib.PrepareRego(
+        data_str.encode("utf-8"),
+        rego_modules_str.encode("utf-8"),
+    )
+
+    result = _read_result(result_ptr)
+    if "error" in result:
+        raise RuntimeError(f"Could not prepare the Rego query: {result['error']}")
+
+    return result["handle"]
+
+
+def eval_prepared(handle: int, input_data: dict[str, str] | bytes):
+    """Evaluates an input against a prepared query. The input can also be
+    given already encoded as JSON, in which case it is passed as is."""
+    if _lib is None:
+        raise RuntimeError(f"Rego library is not available: {_rego_error}")
+
+    result_ptr = _lib.EvalPrepared(handle, _encode_input(input_data))
+
+    return _read_result(result_ptr)
+
+
+def eval_prepared_batch(handle: int, inputs: list[dict[str, str]] | list[bytes]):
+    """Evaluates several inputs against a prepared query in a single call.
+
+    The inputs are evaluated concurrently by the Go library. Returns a list
+    with the result of each input, in the same order as the inputs.
+    """
+    if _lib is None:
+        raise RuntimeError(f"Rego library is not available: {_rego_error}")
+
+    inputs_json = b"[" + b",".join(_encode_input(i) for i in inputs) + b"]"
+    result_ptr = _lib.EvalPreparedBatch(handle, inputs_json)
+
+    return _read_result(result_ptr)
+
+
+def free_prepared(handle: int) -> None:
+    if _lib is not None:
+        _lib.FreePrepared(handle)
+
+
+def _encode_input(input_data: dict[str, str] | bytes) -> bytes:
+    if isinstance(input_data, bytes):
+        return input_data
+    return json.dumps(input_data, separators=(",", ":")).encode("utf-8")
+
+
+def _read_result(result_ptr: int) -> Any:
+    result_json = ctypes.string_at(result_ptr)
     _lib.FreeCString(result_ptr)
 
     return json.loads(result_json)
@@ -1,7 +1,8 @@
 from abc import ABC
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Union, Dict, Any, ClassVar
+from typing import List, Optional, Union, Dict, Any, ClassVar
+from glitch.repr.source import Source
 
 UNDEFINED_POSITION = -33550336
 
@@ -615,10 +616,25 @@ class UnitBlock(Block):
         self.name: str | None = name
         self.path: str = ""
         self.type: UnitBlockType = type
+        # The content of the file in path, shared with the unit blocks inside
+        self.source: Optional[Source] = None
 
     def __repr__(self) -> str:
         return self.name if self.name is not None else ""
 
+    def get_source(self) -> Source:
+        if self.source is None:
+            self.source = Source(self.path)
+        return self.source
+
+    def set_source(self, source: Source) -> None:
+        """Sets the source of this unit block and of the unit blocks inside
+        it that belong to the same file."""
+        self.source = source
+        for u in self.unit_blocks:
+            if u.path == source.path:
+                u.set_source(source)
+
     def add_dependency(self, d: Dependency) -> None:
         self.dependencies.append(d)
 
@@ -653,11 +669,10 @@ class UnitBlock(Block):
 
         lines = -1
         if self.path != "":
-            with open(self.path, "r") as f:
-                try:
-                    lines = sum(1 for _ in f)
-                except Exception:
-                    pass
+            try:
+                lines = len(self.get_source().lines)
+            except (OSError, UnicodeDecodeError):
+                pass
         if lines != -1:
             result["lines"] = lines
 
@@ -0,0 +1,114 @@
+import io
+import os
+import threading
+
+from typing import Any, Dict, List, Optional
+
+# Size of the chunks in which the lines of a file are counted
+COUNT_CHUNK_SIZE = 1 << 16
+
+
+class Source:
+    """The content of a file, read from disk once and shared by everything
+    that needs it after parsing (the parsers themselves, the analyses, the
+    stats and the errors).
+
+    The text and lines are decoded lazily and exactly as open() and
+    readlines() would (default encoding and universal newlines), so both
+    raise UnicodeDecodeError for the same files. Only one copy of the
+    content is kept: the raw content until it is decoded, then the text
+    until it is split into lines."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__data: Optional[bytes] = None
+        self.__size: Optional[int] = None
+        self.__text: Optional[str] = None
+        self.__lines: Optional[List[str]] = None
+        self.__lock = threading.Lock()
+
+    @property
+    def data(self) -> bytes:
+        """The raw content, which is read again if it was already dropped."""
+        with self.__lock:
+            data = self.__data
+            if data is None:
+                with open(self.path, "rb") as f:
+                    data = f.read()
+                self.__size = len(data)
+                if self.__text is None and self.__lines is None:
+                    self.__data = data
+            return data
+
+    @property
+    def size(self) -> int:
+        if self.__size is None:
+            self.data
+        assert self.__size is not None
+        return self.__size
+
+    @property
+    def text(self) -> str:
+        lines = self.__lines
+        if lines is not None:
+            return "".join(lines)
+        if self.__text is None:
+            text = io.TextIOWrapper(io.BytesIO(self.data)).read()
+            with self.__lock:
+                self.__text = text
+                self.__data = None
+            return text
+        return self.__text
+
+    @property
+    def lines(self) -> List[str]:
+        """The lines of the file, as returned by readlines(). The list is
+        shared, so it must be copied before being changed."""
+        if self.__lines is None:
+            lines = io.StringIO(self.text).readlines()
+            with self.__lock:
+                self.__lines = lines
+                self.__text = None
+        return self.__lines
+
+    def line(self, line: int) -> str:
+        return self.lines[line - 1]
+
+    def count_lines(self) -> int:
+        """The number of lines, i.e. len(self.lines). Unless the content was
+        already decoded, the newlines are counted in the raw content, which
+        is only decoded if it is not ASCII or has other line endings."""
+        if self.__lines is None and self.__text is None:
+            data = self.data
+            count = 0
+            for i in range(0, len(data), COUNT_CHUNK_SIZE):
+                chunk = data[i : i + COUNT_CHUNK_SIZE]
+                if not chunk.isascii() or b"\r" in chunk:
+                    break
+                count += chunk.count(b"\n")
+            else:
+                return count + (0 if data[-1:] in (b"", b"\n") else 1)
+        return len(self.lines)
+
+    def open(self) -> "SourceFile":
+        return SourceFile(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickled with the IR (e.g. in the cache) without its content, which
+        # is read again from the path if needed
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["path"])
+
+
+class SourceFile(io.TextIOWrapper):
+    """A text file over the content of a Source, for the parsers that read
+    files as streams. Like the files returned by open(), it is decoded while
+    it is read."""
+
+    def __init__(self, source: Source) -> None:
+        buffer = io.BytesIO(source.data)
+        buffer.name = source.path  # type: ignore
+        super().__init__(buffer)
+        self.source = source
@@ -0,0 +1,217 @@
+import os
+import time
+import multiprocessing
+
+from importlib.resources import files
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Tuple, List, Set, Dict, Any, Optional
+from glitch.analysis.rules import Error, ErrorRecord, RuleVisitor
+from glitch.helpers import get_smells, ini_to_json_dict
+from glitch.stats.stats import FileStats
+from glitch.tech import Tech
+from glitch.repr.inter import UnitBlockType, UnitBlock, Module, Project
+from glitch.parsers.parser import Parser, init_parser_worker
+from glitch.parsers.cache import CachedParser
+from glitch.exclude import Excludes
+from glitch.rego.engine import (
+    load_rego_from_path,
+    prepare_analyses,
+    encode_input,
+    run_analyses,
+)
+
+
+def get_resource_path(resource: str) -> str:
+    return str(files("glitch").joinpath(resource))
+
+
+def get_parser(
+    tech: Tech, cache_dir: Optional[str] = None, excludes: Optional[Excludes] = None
+) -> Parser:
+    # The parsers are imported on demand since each one loads the libraries
+    # of its technology (e.g. lark for Terraform or jsonschema for GHA)
+    parser: Parser
+    if tech == Tech.ansible:
+        from glitch.parsers.ansible import AnsibleParser
+
+        parser = AnsibleParser()
+    elif tech == Tech.chef:
+        from glitch.parsers.chef import ChefParser
+
+        parser = ChefParser()
+    elif tech == Tech.puppet:
+        from glitch.parsers.puppet import PuppetParser
+
+        parser = PuppetParser()
+    elif tech == Tech.terraform:
+        from glitch.parsers.terraform import TerraformParser
+
+        parser = TerraformParser()
+    elif tech == Tech.gha:
+        from glitch.parsers.gha import GithubActionsParser
+
+        parser = GithubActionsParser()
+    else:
+        raise ValueError(f"Invalid tech: {tech}")
+
+    if excludes is not None:
+        parser.excludes = excludes
+    if cache_dir is not None:
+        return CachedParser(parser, tech, cache_dir)
+    return parser
+
+
+def get_parse_executor(parser: Parser, executor: str, n_workers: int) -> Executor:
+    """Creates the workers that parse the modules and files of a single
+    project (or module) concurrently and sets them as the executor of the
+    parser. The project is still assembled and analyzed by the caller."""
+    if isinstance(parser, CachedParser):
+        parser = parser.parser
+
+    pool: Executor
+    if executor == "process":
+        # The workers receive a copy of the parser, which parses serially
+        pool = ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_parser_worker,
+            initargs=(parser,),
+        )
+    else:
+        pool = ThreadPoolExecutor(max_workers=n_workers)
+    parser.executor = pool
+    return pool
+
+
+def filter_analysis(
+    smell_types: Tuple[str, ...], config: str, tech: Tech
+) -> Tuple[Dict[str, str], List[RuleVisitor]]:
+    rego_modules: Dict[str, str] = {}
+    python_analyses: List[RuleVisitor] = []
+
+    rego_lib_path = get_resource_path("rego/queries/library/glitch_lib.rego")
+    if not os.path.exists(rego_lib_path):
+        raise FileNotFoundError("The rego query library does not exist.")
+    load_rego_from_path(rego_lib_path, rego_modules)
+
+    for smell_type in smell_types:
+        smells: List[str] = get_smells([smell_type], tech)
+        fallback: Set[str] = set()
+
+        for smell in smells:
+            rego_path = get_resource_path(f"rego/queries/{smell_type}/{smell}.rego")
+            if os.path.exists(rego_path):
+                load_rego_from_path(rego_path, rego_modules)
+            else:
+                fallback.add(smell)
+
+        if len(fallback) > 0:
+            visitor: RuleVisitor
+            match smell_type:
+                case "design":
+                    from glitch.analysis.design.visitor import DesignVisitor
+
+                    visitor = DesignVisitor(tech, fallback)
+                case "security":
+                    from glitch.analysis.security.visitor import SecurityVisitor
+
+                    visitor = SecurityVisitor(tech, fallback)
+                case _:
+                    raise ValueError(f"Invalid smell type: {smell_type}")
+
+            visitor.config(config)
+            python_analyses.append(visitor)
+
+    return rego_modules, python_analyses
+
+
+def check(
+    inter: Project | Module | UnitBlock,
+    analyses: List[RuleVisitor],
+    stats: FileStats,
+    rego_query: Optional[int],
+    defer_rego: bool = False,
+) -> Tuple[Set[Error], Optional[bytes]]:
+    """Runs the analyses over the IR. If defer_rego is set, the Rego analyses
+    are not evaluated and their input is returned instead, so that the caller
+    can evaluate it together with the inputs of other paths."""
+    start = time.perf_counter()
+    errors: Set[Error] = set()
+    for analysis in analyses:
+        errors.update(analysis.check(inter))
+
+    inputRego = encode_input(inter)
+
+    if not defer_rego:
+        errors.update(run_analyses(inputRego, rego_query))
+    stats.analysis_time += time.perf_counter() - start
+
+    stats.compute(inter)
+
+    if defer_rego:
+        return errors, inputRego
+    return errors, None
+
+
+def parse_and_check(
+    type: UnitBlockType,
+    path: str,
+    module: bool,
+    parser: Parser,
+    analyses: List[RuleVisitor],
+    stats: FileStats,
+    rego_query: Optional[int],
+    defer_rego: bool = False,
+) -> Tuple[Optional[Set[Error]], Optional[bytes]]:
+    """The errors are None if the path could not be parsed."""
+    start = time.perf_counter()
+    inter = parser.parse(path, type, module)
+    stats.parse_time += time.perf_counter() - start
+    if inter == None:
+        return None, None
+
+    return check(inter, analyses, stats, rego_query, defer_rego)
+
+
+# State of a process-pool worker, built once by init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def init_worker(
+    tech: Tech,
+    smell_types: Tuple[str, ...],
+    config: str,
+    defer_rego: bool,
+    cache_dir: Optional[str] = None,
+    excludes: Optional[Excludes] = None,
+) -> None:
+    rego_modules, analyses = filter_analysis(smell_types, config, tech)
+    _worker_state["parser"] = get_parser(tech, cache_dir, excludes)
+    _worker_state["analyses"] = analyses
+    _worker_state["defer_rego"] = defer_rego
+    # When the Rego analyses are deferred, they are evaluated by the parent
+    _worker_state["rego_query"] = (
+        None if defer_rego else prepare_analyses(ini_to_json_dict(config), rego_modules)
+    )
+
+
+def parse_and_check_worker(
+    type: UnitBlockType, path: str, module: bool
+) -> Tuple[Optional[List[ErrorRecord]], FileStats, Optional[bytes]]:
+    # Each worker process handles a single path at a time, so the
+    # analyses built by init_worker do not need to be copied
+    stats = FileStats()
+    start = time.perf_counter()
+    inter = _worker_state["parser"].parse(path, type, module)
+    stats.parse_time += time.perf_counter() - start
+    if inter == None:
+        return None, stats, None
+
+    errors, rego_input = check(
+        inter,
+        _worker_state["analyses"],
+        stats,
+        _worker_state["rego_query"],
+        _worker_state["defer_rego"],
+    )
+    return [e.to_record() for e in errors], stats, rego_input
@@ -0,0 +1,236 @@
+"""Resident lint server used by `glitch serve`.
+
+The server keeps the parsers, analyses and compiled Rego queries of each
+technology loaded, so that editors can lint a file without paying for a new
+GLITCH process. Requests and responses are JSON objects, one per line:
+
+    {"id": 1, "method": "lint", "params": {"tech": "puppet", "path": "a.pp"}}
+    {"id": 1, "result": {"errors": [{"path": "a.pp", "line": 3, ...}]}}
+
+The params of "lint" are the tech, the path of the file, and optionally its
+type (a UnitBlockType) and content. When the content is given, it is linted
+instead of the file on disk, e.g. for unsaved buffers. "ping" answers with an
+empty result and "shutdown" stops the server. Failed requests are answered
+with {"id": ..., "error": "<message>"}.
+"""
+
+import os
+import sys
+import json
+import stat
+import threading
+import contextlib
+import socketserver
+
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+from glitch.tech import Tech
+from glitch.analysis.rules import Error, RuleVisitor
+from glitch.helpers import get_smell_types, ini_to_json_dict
+from glitch.parsers.parser import Parser
+from glitch.repr.inter import UnitBlockType
+from glitch.stats.stats import FileStats
+from glitch.rego.engine import prepare_analyses, free_analyses
+from glitch.runner import (
+    get_resource_path,
+    get_parser,
+    filter_analysis,
+    parse_and_check,
+)
+
+
+class Linter:
+    """The parser, analyses and Rego query used to lint files of a tech."""
+
+    def __init__(
+        self,
+        tech: Tech,
+        config: str,
+        smell_types: Tuple[str, ...],
+        cache_dir: Optional[str],
+    ) -> None:
+        self.tech = tech
+        self.config = config
+        self.parser: Parser = get_parser(tech, cache_dir)
+        # Buffers are written to temporary files, which are never worth caching
+        self.buffer_parser: Parser = get_parser(tech)
+        rego_modules: Dict[str, str]
+        self.analyses: List[RuleVisitor]
+        rego_modules, self.analyses = filter_analysis(smell_types, config, tech)
+        self.rego_query = prepare_analyses(ini_to_json_dict(config), rego_modules)
+
+    def activate(self) -> None:
+        # The visitors keep the config in class attributes, which are shared
+        # with the linters of the other techs
+        for analysis in self.analyses:
+            analysis.config(self.config)
+
+    def __lint(self, path: str, type: UnitBlockType, parser: Parser) -> List[Error]:
+        errors, _ = parse_and_check(
+            type, path, False, parser, self.analyses, FileStats(), self.rego_query
+        )
+        if errors is None:
+            raise ValueError(f"Could not parse {path}")
+        return list(errors)
+
+    def lint(
+        self, path: str, type: UnitBlockType, content: Optional[str] = None
+    ) -> List[Error]:
+        if content is None:
+            return self.__lint(path, type, self.parser)
+
+        # The buffer is written to the same path inside a temporary folder,
+        # since the parsers may depend on the folders of the file
+        with TemporaryDirectory(prefix="glitch-") as tmp:
+            buffer = os.path.join(tmp, os.path.abspath(path).lstrip(os.sep))
+            os.makedirs(os.path.dirname(buffer), exist_ok=True)
+            with open(buffer, "w") as f:
+                f.write(content)
+
+            errors = self.__lint(buffer, type, self.buffer_parser)
+            for error in errors:
+                if error.path == buffer:
+                    error.path = path
+            return errors
+
+    def close(self) -> None:
+        free_analyses(self.rego_query)
+
+
+class LintServer:
+    def __init__(
+        self,
+        config: str,
+        smell_types: Tuple[str, ...] = (),
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        self.config = config
+        self.smell_types = smell_types if smell_types != () else get_smell_types()
+        self.cache_dir = cache_dir
+        self.running = True
+        self.__linters: Dict[Tech, Linter] = {}
+        self.__active: Optional[Linter] = None
+        # Requests are handled one at a time, see Linter.activate
+        self.__lock = threading.Lock()
+
+    def __get_linter(self, tech: str) -> Linter:
+        for t in Tech:
+            if t.tech == tech:
+                break
+        else:
+            raise ValueError(f"'{tech}' is not a valid technology.")
+
+        if t not in self.__linters:
+            config = self.config
+            if t == Tech.terraform:
+                config = get_resource_path("configs/terraform.ini")
+            self.__linters[t] = Linter(t, config, self.smell_types, self.cache_dir)
+
+        linter = self.__linters[t]
+        if self.__active is not linter:
+            linter.activate()
+            self.__active = linter
+        return linter
+
+    def lint(
+        self,
+        tech: str,
+        path: str,
+        type: UnitBlockType = UnitBlockType.unknown,
+        content: Optional[str] = None,
+    ) -> List[Error]:
+        with self.__lock:
+            errors = self.__get_linter(tech).lint(path, type, content)
+        errors.sort(key=lambda e: (e.path, e.line, e.code))
+        return errors
+
+    def __lint(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if "tech" not in params or "path" not in params:
+            raise ValueError("lint requires the 'tech' and 'path' params.")
+
+        type = UnitBlockType(params.get("type", UnitBlockType.unknown))
+        errors = self.lint(params["tech"], params["path"], type, params.get("content"))
+        return {
+            "errors": [
+                {
+                    "path": e.path,
+                    "line": e.line,
+                    "code": e.code,
+                    "description": Error.ALL_ERRORS[e.code],
+                    "opt_msg": e.opt_msg,
+                    "repr": e.repr.split("\n")[0].strip(),
+                }
+                for e in errors
+            ]
+        }
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        id = request.get("id")
+        method = request.get("method")
+        try:
+            if method == "lint":
+                result = self.__lint(request.get("params", {}))
+            elif method == "ping":
+                result = {}
+            elif method == "shutdown":
+                self.running = False
+                result = {}
+            else:
+                raise ValueError(f"Unknown method: {method}")
+        except Exception as e:
+            return {"id": id, "error": str(e)}
+        return {"id": id, "result": result}
+
+    def handle_line(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("The request must be a JSON object.")
+        except ValueError as e:
+            return json.dumps({"id": None, "error": f"Invalid request: {e}"})
+        return json.dumps(self.handle(request))  # type: ignore
+
+    def serve_stdio(self, input: TextIO, output: TextIO) -> None:
+        # Some parsers print their errors, which must not be mixed with the
+        # responses when these are written to stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            for line in input:
+                if line.strip() == "":
+                    continue
+                print(self.handle_line(line), file=output, flush=True)
+                if not self.running:
+                    break
+
+    def serve_unix(self, path: str) -> None:
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if line.strip() == b"":
+                        continue
+                    response = server.handle_line(line.decode("utf-8"))
+                    self.wfile.write(response.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                    if not server.running:
+                        # shutdown() waits for serve_forever, so it cannot
+                        # be called from the thread that handles requests
+                        threading.Thread(target=unix_server.shutdown).start()
+                        break
+
+        if os.path.exists(path):
+            # Left behind by a server that did not stop cleanly
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise FileExistsError(f"{path} exists and is not a socket.")
+            os.remove(path)
+        with socketserver.ThreadingUnixStreamServer(path, Handler) as unix_server:
+            unix_server.daemon_threads = True
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.remove(path)
+
+    def close(self) -> None:
+        for linter in self.__linters.values():
+            linter.close()
+        self.__linters.clear()
@@ -1,25 +1,36 @@
-import pandas as pd  # type: ignore
 from prettytable import PrettyTable
-from typing import List, Dict, Set, Tuple
+from typing import Any, List, Sequence, Tuple
 from glitch.analysis.rules import Error
-from glitch.stats.stats import FileStats
+from glitch.stats.stats import FileStats, SmellStats
 
 
-def print_stats(
-    errors: List[Error], smells: List[str], file_stats: FileStats, format: str
-) -> None:
-    total_files = len(file_stats.files)
-    occurrences: Dict[str, int] = {}
-    files_with_the_smell: Dict[str, Set[str]] = {"Combined": set()}
+def _latex_table(columns: List[str], rows: Sequence[Sequence[Any]]) -> str:
+    """A tabular without index, formatted like pandas' Styler.to_latex with
+    precision=2 and thousands=",": numbers are aligned to the right, and
+    the columns with a float have all their numbers written as floats."""
+    formats: List[str] = []
+    for i in range(len(columns)):
+        values = [row[i] for row in rows]
+        if all(isinstance(v, int) for v in values):
+            formats.append("{:,}")
+        elif all(isinstance(v, (int, float)) for v in values):
+            formats.append("{:,.2f}")
+        else:
+            formats.append("{}")
+
+    column_format = "".join("l" if f == "{}" else "r" for f in formats)
+    lines = ["\\begin{tabular}{" + column_format + "}"]
+    lines.append(" & ".join(columns) + " \\\\")
+    for row in rows:
+        cells = [f.format(v) for f, v in zip(formats, row)]
+        lines.append(" & ".join(cells) + " \\\\")
+    lines.append("\\end{tabular}")
+    return "\n".join(lines) + "\n"
 
-    for smell in smells:
-        occurrences[smell] = 0
-        files_with_the_smell[smell] = set()
 
-    for error in errors:
-        occurrences[error.code] += 1
-        files_with_the_smell[error.code].add(error.path)
-        files_with_the_smell["Combined"].add(error.path)
+def print_stats(smell_stats: SmellStats, file_stats: FileStats, format: str) -> None:
+    total_files = len(file_stats.files)
+    occurrences = smell_stats.occurrences
 
     stats_info: List[Tuple[str, int, float, float]] = []
     total_occur = 0
@@ -32,7 +43,7 @@ def print_stats(
                 Error.ALL_ERRORS[code],
                 n,
                 round(n / (max(1, file_stats.loc) / 1000), 2),
-                round((len(files_with_the_smell[code]) / max(1, total_files)) * 100, 2),
+                round((smell_stats.files[code] / max(1, total_files)) * 100, 2),
             )
         )
     stats_info.append(
@@ -40,9 +51,7 @@ def print_stats(
             "Combined",
             total_occur,
             total_smell_density,
-            round(
-                (len(files_with_the_smell["Combined"]) / max(1, total_files)) * 100, 2
-            ),
+            round((smell_stats.combined_files / max(1, total_files)) * 100, 2),
         )
     )
 
@@ -94,32 +103,22 @@ def print_stats(
             )
         )
         smells_info.append(stats_info[-1])
-        table = pd.DataFrame(
+        latex = _latex_table(
+            [
+                "\\textbf{Smell}",
+                "\\textbf{Occurrences}",
+                "\\textbf{Smell density (Smell/KLoC)}",
+                "\\textbf{Proportion of scripts (%)}",
+            ],
             smells_info,
-            columns=pd.Index(
-                [
-                    "\\textbf{Smell}",
-                    "\\textbf{Occurrences}",
-                    "\\textbf{Smell density (Smell/KLoC)}",
-                    "\\textbf{Proportion of scripts (%)}",
-                ]
-            ),
         )
-        latex = (  # type: ignore
-            table.style.hide(axis="index")  # type: ignore
-            .format(escape=None, precision=2, thousands=",")  # type: ignore
-            .to_latex()  # type: ignore
-        )
-        combined = latex[: latex.rfind("\\\\")].rfind("\\\\")  # type: ignore
-        latex = latex[:combined] + "\\\\\n\\midrule\n" + latex[combined + 3 :]  # type: ignore
-        print(latex)  # type: ignore
+        combined = latex[: latex.rfind("\\\\")].rfind("\\\\")
+        latex = latex[:combined] + "\\\\\n\\midrule\n" + latex[combined + 3 :]
+        print(latex)
 
-        attributes = pd.DataFrame(
-            [[total_files, file_stats.loc]],
-            columns=pd.Index(["\\textbf{Total IaC files}", "\\textbf{Lines of Code}"]),
-        )
         print(
-            attributes.style.hide(axis="index")  # type: ignore
-            .format(escape=None, precision=2, thousands=",")  # type: ignore
-            .to_latex()  # type: ignore
+            _latex_table(
+                ["\\textbf{Total IaC files}", "\\textbf{Lines of Code}"],
+                [[total_files, file_stats.loc]],
+            )
         )
@@ -1,8 +1,10 @@
 import os
-from typing import Union, Set
+from typing import Union, Set, Dict, Iterable
 from abc import ABC, abstractmethod
 
 from glitch.repr.inter import *
+from glitch.repr.source import Source
+from glitch.analysis.rules import Error
 
 CodeElementDict = dict[
     Union["CodeElementDict", CodeElement], Union["CodeElementDict", CodeElement]
@@ -72,10 +74,35 @@ class Stats(ABC):
 
 
 class FileStats(Stats):
+    """Size of the files analyzed and time spent on them.
+
+    Each path is computed into its own FileStats, by the thread or process
+    that analyzes it, and these are merged by the caller afterwards, so a
+    FileStats is never shared between workers."""
+
     def __init__(self) -> None:
         super().__init__()
         self.files: Set[str] = set()
         self.loc = 0
+        self.bytes = 0
+        # Seconds spent parsing and analyzing the paths
+        self.parse_time = 0.0
+        self.analysis_time = 0.0
+
+    def merge(self, other: "FileStats") -> None:
+        self.files.update(other.files)
+        self.loc += other.loc
+        self.bytes += other.bytes
+        self.parse_time += other.parse_time
+        self.analysis_time += other.analysis_time
+
+    def __add_file(self, path: str, source: Source) -> None:
+        self.files.add(path)
+        self.bytes += source.size
+        try:
+            self.loc += source.count_lines()
+        except UnicodeDecodeError:
+            pass
 
     def compute_project(self, p: Project) -> None:
         for m in p.modules:
@@ -87,20 +114,13 @@ class FileStats(Stats):
         for u in m.blocks:
             self.compute(u)
         if os.path.isfile(m.path) and m.path not in self.files:
-            self.files.add(m.path)
-            with open(m.path, "r") as f:
-                self.loc += len(f.readlines())
+            self.__add_file(m.path, Source(m.path))
 
     def compute_unitblock(self, u: UnitBlock) -> None:
         for ub in u.unit_blocks:
             self.compute(ub)
         if os.path.isfile(u.path) and u.path not in self.files:
-            self.files.add(u.path)
-            with open(u.path, "r") as f:
-                try:
-                    self.loc += len(f.readlines())
-                except UnicodeDecodeError:
-                    pass
+            self.__add_file(u.path, u.get_source())
 
     def compute_atomicunit(self, au: AtomicUnit) -> None:
         pass
@@ -119,3 +139,32 @@ class FileStats(Stats):
 
     def compute_comment(self, c: Comment) -> None:
         pass
+
+
+class SmellStats:
+    """Occurrences of each smell and number of files where it appears.
+
+    Only these counters and the paths of the files with smells are kept, so
+    the errors (and the IR they reference) can be released as soon as they
+    are reported. The errors of a file may be added in several calls."""
+
+    def __init__(self, smells: Iterable[str]) -> None:
+        self.occurrences: Dict[str, int] = {smell: 0 for smell in smells}
+        self.files: Dict[str, int] = {smell: 0 for smell in self.occurrences}
+        # Files with at least one smell
+        self.combined_files = 0
+        self.__paths: Set[str] = set()
+        self.__smell_paths: Dict[str, Set[str]] = {
+            smell: set() for smell in self.occurrences
+        }
+
+    def add(self, errors: Iterable[Error]) -> None:
+        for error in errors:
+            self.occurrences[error.code] += 1
+            paths = self.__smell_paths.setdefault(error.code, set())
+            if error.path not in paths:
+                paths.add(error.path)
+                self.files[error.code] += 1
+            if error.path not in self.__paths:
+                self.__paths.add(error.path)
+                self.combined_files += 1
@@ -0,0 +1,173 @@
+"""Writers for the errors reported by lint.
+
+The errors are written as soon as the analysis of each path finishes, so
+none of the writers keep the errors of the previous paths. The JSON based
+formats write one error per line (jsonl) or the SARIF log incrementally,
+opening the results array in begin and closing it in end.
+"""
+
+import json
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+from glitch.analysis.rules import Error
+from glitch.cache import glitch_version
+from glitch.repr.inter import UNDEFINED_POSITION
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+GLITCH_URI = "https://github.com/sr-lab/GLITCH"
+
+
+def _position(value: int) -> Optional[int]:
+    if value == UNDEFINED_POSITION or value < 0:
+        return None
+    return value
+
+
+class ErrorWriter(ABC):
+    def __init__(self, f: TextIO) -> None:
+        self.f = f
+
+    def begin(self) -> None:
+        pass
+
+    @abstractmethod
+    def write(self, errors: Iterable[Error]) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+class TextWriter(ErrorWriter):
+    def write(self, errors: Iterable[Error]) -> None:
+        for error in errors:
+            print(error, file=self.f)
+
+
+class CsvWriter(ErrorWriter):
+    def begin(self) -> None:
+        print("PATH,LINE,ERROR,DESCRIPTION,CODE", file=self.f)
+
+    def write(self, errors: Iterable[Error]) -> None:
+        for error in errors:
+            print(error.to_csv(), file=self.f)
+
+
+class LinterWriter(ErrorWriter):
+    def write(self, errors: Iterable[Error]) -> None:
+        for error in errors:
+            print(Error.ALL_ERRORS[error.code] + "," + error.to_csv(), file=self.f)
+
+
+class JsonLinesWriter(ErrorWriter):
+    """One JSON object per error. Unknown positions are null."""
+
+    def write(self, errors: Iterable[Error]) -> None:
+        for error in errors:
+            record = {
+                "path": error.path,
+                "line": _position(error.line),
+                "column": _position(error.column),
+                "end_line": _position(error.end_line),
+                "end_column": _position(error.end_column),
+                "code": error.code,
+                "description": Error.ALL_ERRORS[error.code],
+                "opt_msg": error.opt_msg,
+                "repr": error.repr.split("\n")[0].strip(),
+            }
+            print(json.dumps(record), file=self.f)
+
+
+class SarifWriter(ErrorWriter):
+    """A SARIF 2.1.0 log with a single run. The rules are the smells being
+    analyzed, which are known before any error is written."""
+
+    def __init__(self, f: TextIO, smells: List[str]) -> None:
+        super().__init__(f)
+        self.rules = {smell: i for i, smell in enumerate(smells)}
+        self.first = True
+        self.tail = ""
+
+    def begin(self) -> None:
+        rules: List[Dict[str, Any]] = []
+        for smell in self.rules:
+            description = Error.ALL_ERRORS[smell]
+            rules.append(
+                {
+                    "id": smell,
+                    "shortDescription": {"text": description.split(" - ")[0]},
+                    "fullDescription": {"text": description},
+                }
+            )
+        driver = {
+            "name": "GLITCH",
+            "version": glitch_version(),
+            "informationUri": GLITCH_URI,
+            "rules": rules,
+        }
+        log = {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [{"tool": {"driver": driver}, "results": []}],
+        }
+        # The results are written between both halves of the empty array
+        head, self.tail = json.dumps(log).rsplit('"results": []', 1)
+        self.f.write(head + '"results": [')
+
+    def __location(self, error: Error) -> Dict[str, Any]:
+        path = Path(error.path)
+        uri = path.as_uri() if path.is_absolute() else path.as_posix()
+        location: Dict[str, Any] = {"artifactLocation": {"uri": uri}}
+
+        line = _position(error.line)
+        if line is not None and line > 0:
+            region = {"startLine": line}
+            column = _position(error.column)
+            end_line = _position(error.end_line)
+            end_column = _position(error.end_column)
+            if column is not None and column > 0:
+                region["startColumn"] = column
+            if end_line is not None and end_line >= line:
+                region["endLine"] = end_line
+                if end_column is not None and end_column > 0:
+                    region["endColumn"] = end_column
+            location["region"] = region
+        return {"physicalLocation": location}
+
+    def write(self, errors: Iterable[Error]) -> None:
+        for error in errors:
+            message = Error.ALL_ERRORS[error.code]
+            if error.opt_msg:
+                message += f"\n-> {error.opt_msg}"
+            result: Dict[str, Any] = {
+                "ruleId": error.code,
+                "level": "warning",
+                "message": {"text": message},
+                "locations": [self.__location(error)],
+            }
+            if error.code in self.rules:
+                result["ruleIndex"] = self.rules[error.code]
+
+            if not self.first:
+                self.f.write(",")
+            self.first = False
+            self.f.write("\n" + json.dumps(result))
+
+    def end(self) -> None:
+        self.f.write("\n]" + self.tail + "\n")
+
+
+def get_writer(
+    f: TextIO, format: Optional[str], linter: bool, csv: bool, smells: List[str]
+) -> ErrorWriter:
+    if format == "jsonl":
+        return JsonLinesWriter(f)
+    elif format == "sarif":
+        return SarifWriter(f, smells)
+    elif linter:
+        return LinterWriter(f)
+    elif csv:
+        return CsvWriter(f)
+    return TextWriter(f)
@@ -0,0 +1,55 @@
+import os
+import unittest
+
+from unittest import mock
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from glitch.analysis import rules
+from glitch.analysis.rules import Error
+
+
+class TestRules(unittest.TestCase):
+    def test_rules_error_repr(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.pp")
+            with open(path, "w") as f:
+                f.write("line 1\n  line 2\nline 3\n")
+            error = Error.from_record(("sec_hard_pass", path, 2, "", "x", 3, 2, 9))
+            self.assertTrue(
+                repr(error).endswith(
+                    "Issue on line 2: "
+                    + "\n".join(
+                        [Error.ALL_ERRORS["sec_hard_pass"], "line 2", "-> x", ""]
+                    )
+                )
+            )
+
+            # Changes to the file are not hidden by the cached lines
+            with open(path, "w") as f:
+                f.write("line 1\nchanged line 2\n")
+            os.utime(path, ns=(0, 0))
+            self.assertIn("\nchanged line 2\n", repr(error))
+
+            with mock.patch.object(rules, "MAX_CACHED_SOURCE_SIZE", 0):
+                self.assertIn("\nchanged line 2\n", repr(error))
+                error.line = 3
+                with self.assertRaises(IndexError):
+                    repr(error)
+
+    @mock.patch.object(rules, "MAX_CACHED_SOURCE_SIZE", 0)
+    def test_rules_get_source_line_large_file(self) -> None:
+        with NamedTemporaryFile("wb", suffix=".pp") as f:
+            f.write("line 1\r\nlíne 2\rline 3\n\nline 5".encode("utf-8"))
+            f.flush()
+            with open(f.name) as g:
+                lines = g.readlines()
+
+            rules.get_source_line(f.name, 1)
+            misses = getattr(rules, "_line_offsets").cache_info().misses
+            for i, line in enumerate(lines):
+                self.assertEqual(rules.get_source_line(f.name, i + 1), line)
+            # The offsets of the lines are only computed once
+            self.assertEqual(
+                getattr(rules, "_line_offsets").cache_info().misses, misses
+            )
+            with self.assertRaises(IndexError):
+                rules.get_source_line(f.name, len(lines) + 1)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import unittest
+
+from tempfile import TemporaryDirectory
+from glitch.tech import Tech
+from glitch.exclude import Excludes
+from glitch.parsers.cache import CachedParser
+from glitch.parsers.puppet import PuppetParser
+from glitch.repr.inter import UnitBlock, UnitBlockType
+
+
+class CountingParser(PuppetParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def parse_file(self, path: str, type: UnitBlockType) -> UnitBlock | None:
+        self.calls += 1
+        return super().parse_file(path, type)
+
+
+class TestCachedParser(unittest.TestCase):
+    def test_cached_parser_reuses_and_invalidates(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "values.pp")
+            shutil.copy("tests/parser/puppet/files/values.pp", path)
+            cache_dir = os.path.join(tmp, "cache")
+
+            parser = CountingParser()
+            cached = CachedParser(parser, Tech.puppet, cache_dir)
+            first = cached.parse(path, UnitBlockType.script, False)
+            second = cached.parse(path, UnitBlockType.script, False)
+            assert isinstance(first, UnitBlock) and isinstance(second, UnitBlock)
+            assert parser.calls == 1
+            assert second.as_dict() == first.as_dict()
+
+            # A different type is a different entry
+            cached.parse(path, UnitBlockType.unknown, False)
+            assert parser.calls == 2
+
+            with open(path, "a") as f:
+                f.write("\n$extra = 1\n")
+            third = cached.parse(path, UnitBlockType.script, False)
+            assert isinstance(third, UnitBlock)
+            assert parser.calls == 3
+            assert len(third.variables) == len(first.variables) + 1
+
+    def test_cached_parser_corrupted_entry(self) -> None:
+        with TemporaryDirectory() as tmp:
+            parser = CountingParser()
+            cached = CachedParser(parser, Tech.puppet, tmp)
+            path = "tests/parser/puppet/files/values.pp"
+            cached.parse(path, UnitBlockType.script, False)
+
+            for root, _, files in os.walk(tmp):
+                for name in files:
+                    with open(os.path.join(root, name), "wb") as f:
+                        f.write(b"corrupted")
+
+            assert isinstance(
+                cached.parse(path, UnitBlockType.script, False), UnitBlock
+            )
+            assert parser.calls == 2
+
+    def test_cached_parser_excludes(self) -> None:
+        with TemporaryDirectory() as tmp:
+            project = os.path.join(tmp, "project")
+            os.makedirs(os.path.join(project, "vendor"))
+            shutil.copy("tests/parser/puppet/files/values.pp", project)
+            cache_dir = os.path.join(tmp, "cache")
+
+            parser = CountingParser()
+            parser.excludes = Excludes(["vendor/"], project)
+            cached = CachedParser(parser, Tech.puppet, cache_dir)
+            cached.parse(project, UnitBlockType.unknown, False)
+            assert parser.calls == 1
+
+            # Excluded files do not invalidate the entry
+            shutil.copy("tests/parser/puppet/files/values.pp", f"{project}/vendor")
+            cached.parse(project, UnitBlockType.unknown, False)
+            assert parser.calls == 1
+
+            # Other patterns are a different entry
+            parser.excludes = Excludes([], project)
+            cached.parse(project, UnitBlockType.unknown, False)
+            assert parser.calls == 3
@@ -0,0 +1,114 @@
+import os
+import sys
+import shutil
+import importlib.util
+import unittest
+
+from tempfile import TemporaryDirectory
+from typing import List
+from glitch.tech import Tech
+from glitch.cache import ResultsCache
+from glitch.analysis.rules import Error, RuleVisitor
+from glitch.analysis.design.visitor import DesignVisitor
+from glitch.stats.stats import FileStats
+from glitch.repr.inter import UnitBlockType
+
+
+class TestResultsCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.config = os.path.join(self.tmp.name, "config.ini")
+        shutil.copy("glitch/configs/default.ini", self.config)
+        self.path = "tests/parser/puppet/files/values.pp"
+        self.smells = ["sec_hard_pass", "sec_hard_user"]
+        self.rego = {"a.rego": "package a", "b.rego": "package b"}
+        self.analyses: List[RuleVisitor] = []
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def __cache(self) -> ResultsCache:
+        return ResultsCache(
+            self.cache_dir,
+            Tech.puppet,
+            self.config,
+            self.smells,
+            self.rego,
+            self.analyses,
+        )
+
+    def __store(self) -> None:
+        cache = self.__cache()
+        entry = cache.entry(self.path, UnitBlockType.script)
+        assert entry is not None
+        stats = FileStats()
+        stats.files.add(self.path)
+        stats.loc = 10
+        error = Error.from_record(
+            ("sec_hard_pass", self.path, 3, "$pass", None, 5, 3, 10)
+        )
+        cache.store(entry, {error}, stats)
+
+    def __load(self) -> bool:
+        cache = self.__cache()
+        entry = cache.entry(self.path, UnitBlockType.script)
+        assert entry is not None
+        return cache.load(entry) is not None
+
+    def test_results_cache_hit(self) -> None:
+        self.__store()
+        cache = self.__cache()
+        entry = cache.entry(self.path, UnitBlockType.script)
+        assert entry is not None
+        result = cache.load(entry)
+        assert result is not None
+        records, stats = result
+        assert records == [("sec_hard_pass", self.path, 3, "$pass", None, 5, 3, 10)]
+        assert stats.files == {self.path} and stats.loc == 10
+
+        entry = cache.entry(self.path, UnitBlockType.vars)
+        assert entry is not None and cache.load(entry) is None
+
+    def test_results_cache_config(self) -> None:
+        self.__store()
+        with open(self.config, "a") as f:
+            f.write("\n# Comments do not change the config\n")
+        assert self.__load()
+
+        with open(self.config) as f:
+            config = f.read()
+        with open(self.config, "w") as f:
+            f.write(config.replace("[security]", "[security]\nnew_key = []", 1))
+        assert not self.__load()
+
+    def test_results_cache_rules(self) -> None:
+        self.__store()
+        self.rego = {"a.rego": "package a", "b.rego": "package b # changed"}
+        assert not self.__load()
+        self.rego = {"a.rego": "package a", "b.rego": "package b"}
+        self.smells = ["sec_hard_pass"]
+        assert not self.__load()
+
+    def test_results_cache_checkers(self) -> None:
+        checker = os.path.join(self.tmp.name, "checker.py")
+        with open(checker, "w") as f:
+            f.write("class Checker:\n    pass\n")
+        spec = importlib.util.spec_from_file_location("glitch_checker", checker)
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        # The source of a class is found through the module that defines it
+        sys.modules["glitch_checker"] = module
+        self.addCleanup(sys.modules.pop, "glitch_checker")
+
+        visitor = DesignVisitor(Tech.puppet, set())
+        visitor.checkers.append(module.Checker())
+        self.analyses = [visitor]
+        self.__store()
+        assert self.__load()
+
+        # Editing the source of a checker invalidates the results
+        with open(checker, "a") as f:
+            f.write("# changed\n")
+        assert not self.__load()
@@ -1,10 +1,21 @@
+import os
 import csv
+import json
+import shutil
+import pytest
 import subprocess
 import glitch.__main__ as glitch
 
-from typing import Callable, Set, Tuple, List
+from io import BytesIO
+from typing import Any, Callable, Dict, Set, Tuple, List
 from glitch.tech import Tech
-from tempfile import NamedTemporaryFile
+from glitch.exclude import Excludes
+from glitch.runner import get_parser
+from glitch.parsers.parser import Parser
+from glitch.helpers import get_changed_files
+from glitch.server import LintServer
+from glitch.lsp import LanguageServer, get_tech
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 
 def test_cli_help():
@@ -12,6 +23,33 @@ def test_cli_help():
     assert run.returncode == 0
 
 
+def __imported_packages(*args: str) -> Set[str]:
+    # Each line of -X importtime is "import time: self | cumulative | module"
+    run = subprocess.run(
+        ["python", "-X", "importtime", "-m", "glitch", *args], capture_output=True
+    )
+    assert run.returncode == 0
+    packages: Set[str] = set()
+    for line in run.stderr.decode().splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            packages.add(line.split("|")[2].strip().split(".")[0])
+    return packages
+
+
+def test_cli_import_time():
+    # The libraries of the other subcommands and techs must not be loaded
+    heavy = {"pandas", "z3", "lark", "hcl2", "ruamel", "jinja2", "jsonschema"}
+    packages = __imported_packages("--help")
+    assert "glitch" in packages
+    assert packages.isdisjoint(heavy | {"puppetparser", "tqdm"})
+
+    packages = __imported_packages(
+        "repr", "--tech", "puppet", "tests/parser/puppet/files/values.pp"
+    )
+    assert "puppetparser" in packages
+    assert packages.isdisjoint(heavy)
+
+
 def test_cli_get_paths():
     __get_paths_and_title: Callable[[str, str, Tech], Tuple[Set[str], str]] = getattr(
         glitch, "__get_paths_and_title"
@@ -37,6 +75,29 @@ def test_cli_get_paths():
     assert paths == {"tests/cli/resources/chef_project"}
 
 
+def test_cli_get_paths_excludes():
+    __get_paths_and_title: Callable[
+        [str, str, Tech, Excludes], Tuple[Set[str], str]
+    ] = getattr(glitch, "__get_paths_and_title")
+    with TemporaryDirectory() as tmp:
+        for folder in ["recipes", "vendor/recipes", ".kitchen", "other/.kitchen"]:
+            os.makedirs(os.path.join(tmp, folder))
+            with open(os.path.join(tmp, folder, "default.rb"), "w") as f:
+                f.write("package 'nginx'\n")
+        with open(os.path.join(tmp, ".glitchignore"), "w") as f:
+            f.write("# Vendored cookbooks\nvendor/\n")
+
+        excludes = Excludes.load(tmp, Tech.chef, ["other/"], True)
+        paths, _ = __get_paths_and_title("include-all", tmp, Tech.chef, excludes)
+        assert paths == {os.path.join(tmp, "recipes", "default.rb")}
+        paths, _ = __get_paths_and_title("dataset", tmp, Tech.chef, excludes)
+        assert paths == {os.path.join(tmp, "recipes")}
+
+        excludes = Excludes.load(tmp, Tech.chef, [], False)
+        paths, _ = __get_paths_and_title("include-all", tmp, Tech.chef, excludes)
+        assert len(paths) == 3
+
+
 def test_cli_lint():
     with NamedTemporaryFile() as f:
         run = subprocess.run(
@@ -83,3 +144,392 @@ def test_cli_lint():
             "Hard-coded user - Developers should not reveal sensitive information in the source code. (CWE-798)",
             "user 'root'",
         ]
+
+
+def test_cli_lint_process_executor():
+    with NamedTemporaryFile() as f:
+        run = subprocess.run(
+            [
+                "glitch",
+                "lint",
+                "--tech",
+                "chef",
+                "--folder-strategy",
+                "include-all",
+                "--executor",
+                "process",
+                "--n-workers",
+                "2",
+                "--csv",
+                "tests/cli/resources/chef_project",
+                f.name,
+            ],
+            capture_output=True,
+        )
+        assert run.returncode == 0
+
+        with open(f.name, "r") as f:
+            rows = list(csv.reader(f))
+
+        assert len(rows) == 3
+        assert [row[:3] for row in rows[1:]] == [
+            ["tests/cli/resources/chef_project/test.rb", "8", "sec_def_admin"],
+            ["tests/cli/resources/chef_project/test.rb", "8", "sec_hard_user"],
+        ]
+
+
+def test_cli_lint_format():
+    outputs: Dict[str, str] = {}
+    for format in ("jsonl", "sarif"):
+        run = subprocess.run(
+            [
+                "glitch",
+                "lint",
+                "--tech",
+                "chef",
+                "--folder-strategy",
+                "include-all",
+                "--format",
+                format,
+                "tests/cli/resources/chef_project",
+            ],
+            capture_output=True,
+        )
+        assert run.returncode == 0
+        outputs[format] = run.stdout.decode()
+
+    errors = [json.loads(line) for line in outputs["jsonl"].splitlines()]
+    assert [(e["line"], e["code"]) for e in errors] == [
+        (8, "sec_def_admin"),
+        (8, "sec_hard_user"),
+    ]
+    assert all(e["column"] is not None for e in errors)
+
+    results = json.loads(outputs["sarif"])["runs"][0]["results"]
+    assert [r["ruleId"] for r in results] == ["sec_def_admin", "sec_hard_user"]
+    region = results[0]["locations"][0]["physicalLocation"]["region"]
+    assert region["startLine"] == 8
+    assert region["startColumn"] == errors[0]["column"]
+
+
+def test_cli_lint_format_conflict():
+    run = subprocess.run(
+        [
+            "glitch",
+            "lint",
+            "--tech",
+            "chef",
+            "--csv",
+            "--format",
+            "jsonl",
+            "tests/cli/resources/chef_project",
+        ],
+        capture_output=True,
+    )
+    assert run.returncode == 2
+
+
+def test_cli_repr_cache_dir():
+    with TemporaryDirectory() as cache_dir:
+        outputs: List[bytes] = []
+        for _ in range(2):
+            run = subprocess.run(
+                [
+                    "glitch",
+                    "repr",
+                    "--tech",
+                    "puppet",
+                    "--cache-dir",
+                    cache_dir,
+                    "tests/parser/puppet/files/values.pp",
+                ],
+                capture_output=True,
+            )
+            assert run.returncode == 0
+            outputs.append(run.stdout)
+
+        assert len(os.listdir(cache_dir)) == 1
+        assert outputs[0] != b"" and outputs[0] == outputs[1]
+
+
+__FilterChangedPaths = Callable[
+    [Set[str], Set[str], Tech, Parser, str, bool], Tuple[Set[str], Set[str]]
+]
+
+
+def test_cli_changed_since():
+    __filter_changed_paths: __FilterChangedPaths = getattr(
+        glitch, "__filter_changed_paths"
+    )
+    __get_paths_and_title: Callable[[str, str, Tech], Tuple[Set[str], str]] = getattr(
+        glitch, "__get_paths_and_title"
+    )
+
+    with TemporaryDirectory() as repo:
+        git = ["git", "-C", repo, "-c", "user.name=glitch", "-c", "user.email=glitch"]
+        project = os.path.join(repo, "chef_project")
+        shutil.copytree("tests/cli/resources/chef_project", project)
+        with open(os.path.join(repo, "other.rb"), "w") as f:
+            f.write("package 'nginx'\n")
+        subprocess.run(git + ["init", "-q"], check=True)
+        subprocess.run(git + ["add", "."], check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], check=True)
+
+        assert get_changed_files(repo, "HEAD") == set()
+        with pytest.raises(ValueError):
+            get_changed_files(repo, "not-a-ref")
+
+        with open(os.path.join(project, "test.rb"), "a") as f:
+            f.write("\n")
+        with open(os.path.join(repo, "new.rb"), "w") as f:
+            f.write("package 'git'\n")
+        with open(os.path.join(repo, "README"), "w") as f:
+            f.write("readme\n")
+
+        changed = get_changed_files(repo, "HEAD")
+        assert changed == {
+            os.path.realpath(os.path.join(project, "test.rb")),
+            os.path.realpath(os.path.join(repo, "new.rb")),
+            os.path.realpath(os.path.join(repo, "README")),
+        }
+
+        chef = get_parser(Tech.chef)
+        paths, _ = __get_paths_and_title("include-all", repo, Tech.chef)
+        assert __filter_changed_paths(paths, changed, Tech.chef, chef, repo, False) == (
+            {os.path.join(project, "test.rb"), os.path.join(repo, "new.rb")},
+            set(),
+        )
+
+        # The file is not in a module of the project
+        paths, _ = __get_paths_and_title("dataset", repo, Tech.chef)
+        assert __filter_changed_paths(paths, changed, Tech.chef, chef, repo, False) == (
+            {os.path.join(project, "test.rb")},
+            set(),
+        )
+        assert __filter_changed_paths(
+            paths, changed, Tech.puppet, get_parser(Tech.puppet), repo, False
+        ) == (set(), set())
+
+        paths, _ = __get_paths_and_title("module", project, Tech.chef)
+        assert __filter_changed_paths(
+            paths, changed, Tech.chef, chef, project, True
+        ) == ({project}, {project})
+
+
+def test_cli_changed_since_modules():
+    __filter_changed_paths: __FilterChangedPaths = getattr(
+        glitch, "__filter_changed_paths"
+    )
+    __get_paths_and_title: Callable[
+        [str, str, Tech, Excludes], Tuple[Set[str], str]
+    ] = getattr(glitch, "__get_paths_and_title")
+
+    with TemporaryDirectory() as repo:
+        repo = os.path.realpath(repo)
+        git = ["git", "-C", repo, "-c", "user.name=glitch", "-c", "user.email=glitch"]
+        for file in [
+            "site.pp",
+            "modules/a/manifests/init.pp",
+            "modules/b/manifests/init.pp",
+            "env/modules/c/manifests/sub/init.pp",
+            "modules/b/.bundle/init.pp",
+        ]:
+            os.makedirs(os.path.dirname(os.path.join(repo, file)), exist_ok=True)
+            with open(os.path.join(repo, file), "w") as f:
+                f.write("$a = 1\n")
+        subprocess.run(git + ["init", "-q"], check=True)
+        subprocess.run(git + ["add", "."], check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], check=True)
+
+        for file in [
+            "site.pp",
+            "modules/a/manifests/init.pp",
+            "env/modules/c/manifests/sub/init.pp",
+            "modules/b/.bundle/init.pp",
+        ]:
+            with open(os.path.join(repo, file), "a") as f:
+                f.write("$b = 2\n")
+        changed = get_changed_files(repo, "HEAD")
+
+        # The untouched module b is skipped, as well as its excluded .bundle folder
+        puppet = get_parser(
+            Tech.puppet, None, Excludes.load(repo, Tech.puppet, [], True)
+        )
+        expected = {
+            os.path.join(repo, "site.pp"),
+            os.path.join(repo, "modules", "a"),
+            os.path.join(repo, "env", "modules", "c"),
+        }
+        modules = expected - {os.path.join(repo, "site.pp")}
+        paths, _ = __get_paths_and_title("project", repo, Tech.puppet, puppet.excludes)
+        assert __filter_changed_paths(
+            paths, changed, Tech.puppet, puppet, repo, False
+        ) == (expected, modules)
+        paths, _ = __get_paths_and_title(
+            "include-all", repo, Tech.puppet, puppet.excludes
+        )
+        assert __filter_changed_paths(
+            paths, changed, Tech.puppet, puppet, repo, False
+        ) == (expected, modules)
+
+    with TemporaryDirectory() as root:
+        ansible = get_parser(Tech.ansible)
+        assert ansible.get_module(f"{root}/roles/r/tasks/main.yml", root) == (
+            f"{root}/roles/r"
+        )
+        assert ansible.get_module(f"{root}/roles/main.yml", root) is None
+        assert ansible.get_module(f"{root}/playbooks/site.yml", root) is None
+
+        chef = get_parser(Tech.chef)
+        assert chef.get_module(f"{root}/recipes/default.rb", root) == root
+        assert chef.get_module(f"{root}/cookbooks/c/recipes/a.rb", root) == (
+            f"{root}/cookbooks/c"
+        )
+        assert chef.get_module(f"{root}/site/attributes/a.rb", root) == f"{root}/site"
+        assert chef.get_module(f"{root}/cookbooks/c/metadata.rb", root) is None
+        assert chef.get_module(f"{root}/cookbooks/c/spec/a/a.rb", root) is None
+
+        terraform = get_parser(Tech.terraform)
+        assert terraform.get_module(f"{root}/env/main.tf", root) == f"{root}/env"
+
+
+def test_cli_serve():
+    path = "tests/cli/resources/chef_project/test.rb"
+    with open(path) as f:
+        content = f.read()
+    requests = [
+        {"id": 1, "method": "lint", "params": {"tech": "chef", "path": path}},
+        {
+            "id": 2,
+            "method": "lint",
+            "params": {"tech": "chef", "path": "unsaved.rb", "content": content},
+        },
+        {"id": 3, "method": "shutdown"},
+    ]
+    run = subprocess.run(
+        ["glitch", "serve"],
+        input="\n".join(json.dumps(r) for r in requests) + "\n",
+        capture_output=True,
+        text=True,
+    )
+    assert run.returncode == 0
+
+    responses = [json.loads(line) for line in run.stdout.splitlines()]
+    assert [r["id"] for r in responses] == [1, 2, 3]
+    for response, expected_path in zip(responses, [path, "unsaved.rb"]):
+        errors = response["result"]["errors"]
+        assert [(e["path"], e["line"], e["code"]) for e in errors] == [
+            (expected_path, 8, "sec_def_admin"),
+            (expected_path, 8, "sec_hard_user"),
+        ]
+
+
+def test_cli_serve_invalid_requests():
+    server = LintServer("glitch/configs/default.ini")
+    assert json.loads(server.handle_line("not json"))["id"] is None
+    assert server.handle({"id": 1, "method": "unknown"}) == {
+        "id": 1,
+        "error": "Unknown method: unknown",
+    }
+    assert "error" in server.handle({"id": 2, "method": "lint", "params": {}})
+    assert "error" in server.handle(
+        {"id": 3, "method": "lint", "params": {"tech": "cobol", "path": "a"}}
+    )
+    assert server.handle({"id": 4, "method": "ping"}) == {"id": 4, "result": {}}
+    assert server.running
+    server.handle({"id": 5, "method": "shutdown"})
+    assert not server.running
+
+
+def __lsp_messages(*messages: Dict[str, Any]) -> bytes:
+    data = b""
+    for message in messages:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        data += f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    return data
+
+
+def __lsp_responses(data: bytes) -> List[Dict[str, Any]]:
+    responses: List[Dict[str, Any]] = []
+    while data != b"":
+        header, data = data.split(b"\r\n\r\n", 1)
+        length = int(header.split(b":")[1])
+        responses.append(json.loads(data[:length]))
+        data = data[length:]
+    return responses
+
+
+def test_cli_lsp_handshake():
+    assert get_tech("site/manifests/init.pp") == Tech.puppet
+    assert get_tech("repo/.github/workflows/ci.yml") == Tech.gha
+    assert get_tech("playbook.yml") == Tech.ansible
+    assert get_tech("README.md") is None
+
+    output = BytesIO()
+    language_server = LanguageServer(
+        LintServer("glitch/configs/default.ini"),
+        BytesIO(
+            __lsp_messages(
+                {"id": 1, "method": "initialize", "params": {"capabilities": {}}},
+                {"method": "initialized", "params": {}},
+                {"id": 2, "method": "textDocument/hover", "params": {}},
+                {"id": 3, "method": "shutdown"},
+                {"method": "exit"},
+            )
+        ),
+        output,
+    )
+    language_server.serve()
+
+    responses = __lsp_responses(output.getvalue())
+    assert [r["id"] for r in responses] == [1, 2, 3]
+    assert responses[0]["result"]["capabilities"]["textDocumentSync"]["change"] == 1
+    assert "error" in responses[1]
+    assert responses[2]["result"] is None
+
+
+def test_cli_lsp():
+    with open("tests/cli/resources/chef_project/test.rb") as f:
+        text = f.read()
+    uri = "file:///project/recipes/test.rb"
+    process = subprocess.Popen(
+        ["glitch", "lsp"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    )
+    assert process.stdin is not None and process.stdout is not None
+
+    def receive() -> Dict[str, Any]:
+        assert process.stdout is not None
+        length = 0
+        while (header := process.stdout.readline().strip()) != b"":
+            length = int(header.split(b":")[1])
+        return json.loads(process.stdout.read(length))
+
+    process.stdin.write(
+        __lsp_messages(
+            {"id": 1, "method": "initialize", "params": {"capabilities": {}}},
+            {
+                "method": "textDocument/didOpen",
+                "params": {
+                    "textDocument": {
+                        "uri": uri,
+                        "languageId": "ruby",
+                        "version": 1,
+                        "text": text,
+                    }
+                },
+            },
+        )
+    )
+    process.stdin.flush()
+    assert receive()["id"] == 1
+    diagnostics = receive()["params"]
+
+    process.stdin.write(__lsp_messages({"id": 2, "method": "shutdown"}))
+    process.stdin.write(__lsp_messages({"method": "exit"}))
+    process.stdin.close()
+    assert process.wait(timeout=60) == 0
+
+    assert diagnostics["uri"] == uri
+    assert sorted(
+        (d["range"]["start"]["line"], d["code"]) for d in diagnostics["diagnostics"]
+    ) == [(7, "sec_def_admin"), (7, "sec_hard_user")]
@@ -1,6 +1,11 @@
+import os
+
+from concurrent.futures import ThreadPoolExecutor
 from tests.design.design_helper import BaseDesignTest
 from glitch.tech import Tech
-from glitch.repr.inter import UNDEFINED_POSITION
+from glitch.repr.inter import UNDEFINED_POSITION, UnitBlockType
+from glitch.parsers.puppet import PuppetParser
+from glitch.runner import filter_analysis
 
 
 class TestDesign(BaseDesignTest):
@@ -108,3 +113,26 @@ class TestDesign(BaseDesignTest):
             ],
             [UNDEFINED_POSITION],
         )
+
+    def test_puppet_shared_visitor(self) -> None:
+        # The same visitors are used by every thread, without copies
+        _, analyses = filter_analysis(
+            ("design",), "tests/design/puppet/design_puppet.ini", Tech.puppet
+        )
+        folder = "tests/design/puppet/files"
+        blocks = [
+            PuppetParser().parse_file(os.path.join(folder, f), UnitBlockType.script)
+            for f in sorted(os.listdir(folder))
+        ] * 4
+
+        def check(block):  # type: ignore
+            return sorted(
+                (e.path, e.line, e.code) for a in analyses for e in a.check(block)
+            )
+
+        expected = [check(b) for b in blocks]
+        self.assertTrue(any(len(errors) > 0 for errors in expected))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(list(executor.map(check, blocks)), expected)
+        # Nothing about the checked code is left in the visitors
+        self.assertTrue(all(a.code is None for a in analyses))
@@ -1,4 +1,12 @@
+import os
+import shutil
+import pytest
+
+from unittest import mock
+from tempfile import TemporaryDirectory
 from glitch.parsers.chef import ChefParser
+from glitch.parsers import ripper_parser
+from glitch.parsers.ripper_worker import RipperPool, RipperError
 from glitch.repr.inter import *
 from tests.parser.test_parser import TestParser
 
@@ -991,6 +999,41 @@ class TestChefParser(TestParser):
         assert isinstance(case_stmt.statements[0], Attribute)
         assert isinstance(case_stmt.statements[1], Attribute)
 
+    def test_chef_parser_ripper_worker_reused(self) -> None:
+        pool = RipperPool()
+        try:
+            first = pool.parse("tests/parser/chef/files/valid_manifest.rb")
+            with pytest.raises(RipperError):
+                pool.parse("tests/parser/chef/files/does_not_exist.rb")
+            # The worker survives the error and gives the same result
+            assert pool.parse("tests/parser/chef/files/valid_manifest.rb") == first
+            assert first.startswith("[:program,")
+        finally:
+            pool.close()
+
+    def test_chef_parser_no_table_files(self) -> None:
+        folder = os.path.dirname(ripper_parser.__file__)
+        files = set(os.listdir(folder))
+        # The parsing tables are built again, and only kept in memory
+        with mock.patch.object(ripper_parser, "_parser", None):
+            self.__parse("tests/parser/chef/files/valid_manifest.rb")
+        assert set(os.listdir(folder)) == files
+
+    def test_chef_parser_attributes_type(self) -> None:
+        with TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "attributes"))
+            path = os.path.join(tmp, "attributes", "default.rb")
+            shutil.copy("tests/parser/chef/files/valid_manifest.rb", path)
+
+            module = ChefParser().parse_module(tmp)
+            assert len(module.blocks) == 1
+            assert module.blocks[0].type == UnitBlockType.vars
+
+            # The type of a single file does not depend on its folder
+            ir = ChefParser().parse_file(path, UnitBlockType.vars)
+            assert ir is not None
+            assert ir.type == UnitBlockType.script
+
 
 # TODO:
 # block_var
@@ -294,3 +294,10 @@ class TestGithubActionsParser(TestParser):
             "tests/parser/gha/files/index_out_of_range.yml", UnitBlockType.script
         )
         assert ir is not None
+
+    def test_gha_parser_invalid_workflow(self) -> None:
+        p = GithubActionsParser()
+        ir = p.parse_file(
+            "tests/parser/gha/files/invalid_workflow.yml", UnitBlockType.script
+        )
+        assert ir is None
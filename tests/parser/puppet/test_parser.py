@@ -546,3 +546,12 @@ class TestPuppetParser(TestParser):
         )
         assert unit_block is not None
         assert len(unit_block.unit_blocks) == 1
+
+    def test_puppet_parser_source(self) -> None:
+        path = "tests/parser/puppet/files/edge_case.pp"
+        unit_block = PuppetParser().parse_file(path, UnitBlockType.script)
+        assert unit_block is not None and unit_block.source is not None
+        with open(path) as f:
+            assert unit_block.source.lines == f.readlines()
+        # The unit blocks inside share the content of the file
+        assert unit_block.unit_blocks[0].source is unit_block.source
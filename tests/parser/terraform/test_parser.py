@@ -446,3 +446,11 @@ class TestTerraform(TestParser):
         assert len(ir.atomic_units) == 1
         assert len(ir.atomic_units[0].statements) == 1
         assert len(ir.atomic_units[0].attributes) == 1
+
+    def test_terraform_parser_inline_transform(self) -> None:
+        for name in ["comments.tf", "conditional.tf", "dynamic_block.tf"]:
+            path = f"tests/parser/terraform/files/{name}"
+            inline = TerraformParser().parse_file(path, UnitBlockType.unknown)
+            tree = TerraformParser(inline=False).parse_file(path, UnitBlockType.unknown)
+            assert inline is not None and tree is not None
+            self.assertEqual(inline.as_dict(), tree.as_dict())
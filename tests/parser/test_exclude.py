@@ -0,0 +1,128 @@
+import os
+import shutil
+import unittest
+
+from typing import List
+from tempfile import TemporaryDirectory
+from glitch.tech import Tech
+from glitch.exclude import Excludes
+from glitch.parsers.puppet import PuppetParser
+
+
+class RecordingExcludes(Excludes):
+    def __init__(self, patterns: List[str], root: str) -> None:
+        super().__init__(patterns, root)
+        self.scanned: List[str] = []
+
+    def scandir(self, path: str) -> List[os.DirEntry[str]]:
+        self.scanned.append(os.path.relpath(path, self.root))
+        return super().scandir(path)
+
+
+class TestExcludes(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def __touch(self, *paths: str) -> None:
+        for path in paths:
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+    def __excluded(self, excludes: Excludes, path: str, is_dir: bool) -> bool:
+        return excludes.excluded(os.path.join(self.root, path), is_dir)
+
+    def test_exclude_patterns(self) -> None:
+        excludes = Excludes(
+            ["*.auto.tfvars", "vendor/", "roles/legacy", "**/test/fixtures/"],
+            self.root,
+        )
+        self.assertTrue(self.__excluded(excludes, "a.auto.tfvars", False))
+        self.assertTrue(self.__excluded(excludes, "env/prod.auto.tfvars", False))
+        self.assertFalse(self.__excluded(excludes, "prod.tfvars", False))
+
+        self.assertTrue(self.__excluded(excludes, "vendor", True))
+        self.assertTrue(self.__excluded(excludes, "modules/vendor", True))
+        self.assertFalse(self.__excluded(excludes, "vendor", False))
+
+        self.assertTrue(self.__excluded(excludes, "roles/legacy", True))
+        self.assertTrue(self.__excluded(excludes, "roles/legacy", False))
+        self.assertFalse(self.__excluded(excludes, "other/roles/legacy", True))
+
+        self.assertTrue(self.__excluded(excludes, "test/fixtures", True))
+        self.assertTrue(self.__excluded(excludes, "a/b/test/fixtures", True))
+        self.assertFalse(self.__excluded(excludes, "a/test/fixtures", False))
+
+    def test_exclude_walk_prunes(self) -> None:
+        self.__touch(
+            "main.tf",
+            "main.tf.bak",
+            "modules/a/main.tf",
+            ".terraform/modules/b/main.tf",
+            "modules/a/.terraform/c/main.tf",
+        )
+        excludes = RecordingExcludes([".terraform/", "*.bak"], self.root)
+
+        walked = [
+            (os.path.relpath(root, self.root), dirs, files)
+            for root, dirs, files in excludes.walk(self.root)
+        ]
+        self.assertEqual(
+            walked,
+            [
+                (".", ["modules"], ["main.tf"]),
+                ("modules", ["a"], []),
+                ("modules/a", [], ["main.tf"]),
+            ],
+        )
+        self.assertEqual(excludes.scanned, [".", "modules", "modules/a"])
+
+        bottom_up = [root for root, _, _ in excludes.walk(self.root, topdown=False)]
+        self.assertEqual(
+            [os.path.relpath(root, self.root) for root in bottom_up],
+            ["modules/a", "modules", "."],
+        )
+
+    def test_exclude_load(self) -> None:
+        with open(os.path.join(self.root, ".glitchignore"), "w") as f:
+            f.write("# Generated\n\nbuild/\n  *.gen.pp  \n")
+
+        excludes = Excludes.load(self.root, Tech.puppet, ["tmp/"], True)
+        self.assertEqual(excludes.patterns[0], ".git/")
+        self.assertIn("**/spec/fixtures/", excludes.patterns)
+        self.assertEqual(excludes.patterns[-3:], ["build/", "*.gen.pp", "tmp/"])
+
+        excludes = Excludes.load(
+            os.path.join(self.root, "site.pp"), Tech.puppet, [], False
+        )
+        self.assertEqual(excludes.patterns, ["build/", "*.gen.pp"])
+        self.assertEqual(excludes.root, self.root)
+
+    def test_exclude_parse_folder(self) -> None:
+        files = "tests/parser/puppet/files"
+        name = sorted(os.listdir(files))[0]
+        for folder in [
+            "modules/m/manifests",
+            "modules/vendored/manifests",
+            "spec/fixtures",
+            "modules/m/spec/fixtures",
+        ]:
+            os.makedirs(os.path.join(self.root, folder))
+            shutil.copy(os.path.join(files, name), os.path.join(self.root, folder))
+
+        parser = PuppetParser()
+        parser.excludes = Excludes.load(self.root, Tech.puppet, ["vendored"], True)
+        project = parser.parse_folder(self.root)
+        self.assertEqual([m.name for m in project.modules], ["m"])
+        self.assertEqual(len(project.modules[0].blocks), 1)
+        self.assertEqual(len(project.blocks), 0)
+
+        project = PuppetParser().parse_folder(self.root)
+        modules = sorted(project.modules, key=lambda m: m.name)
+        self.assertEqual([m.name for m in modules], ["m", "vendored"])
+        self.assertEqual(len(modules[0].blocks), 2)
+        self.assertEqual(len(project.blocks), 1)
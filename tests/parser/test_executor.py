@@ -0,0 +1,96 @@
+import os
+import shutil
+import unittest
+import multiprocessing
+
+from typing import List
+from tempfile import TemporaryDirectory
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from glitch.parsers.parser import Parser, init_parser_worker
+from glitch.parsers.ansible import AnsibleParser
+from glitch.parsers.puppet import PuppetParser
+from glitch.repr.inter import Project, UnitBlockType
+from glitch.exclude import Excludes
+
+
+class TestParserExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def __copy(self, files: str, names: List[str], folder: str) -> None:
+        os.makedirs(os.path.join(self.tmp.name, folder), exist_ok=True)
+        for i, name in enumerate(names):
+            shutil.copy(
+                os.path.join(files, name),
+                os.path.join(self.tmp.name, folder, f"{i}_{name}"),
+            )
+
+    def __assert_same_project(self, serial: Parser, parallel: Parser) -> None:
+        expected = serial.parse(self.tmp.name, UnitBlockType.unknown, False)
+        project = parallel.parse(self.tmp.name, UnitBlockType.unknown, False)
+        assert expected is not None and project is not None
+        self.assertEqual(project.as_dict(), expected.as_dict())
+
+    def test_executor_puppet_project(self) -> None:
+        files = "tests/parser/puppet/files"
+        names = sorted(os.listdir(files))
+        for i in range(4):
+            self.__copy(files, names[i::2], f"modules/m{i}/manifests")
+        self.__copy(files, names[:3], "")
+        self.__copy(files, names[3:5], "env/modules/n/manifests")
+
+        parser = PuppetParser()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            parser.executor = executor
+            self.__assert_same_project(PuppetParser(), parser)
+
+    def test_executor_ansible_project_processes(self) -> None:
+        files = "tests/parser/ansible/files"
+        names = sorted(f for f in os.listdir(files) if f.startswith("valid_"))
+        for i in range(3):
+            self.__copy(files, names[i::3], f"roles/r{i}/tasks")
+            self.__copy(files, ["valid_vars.yml"], f"roles/r{i}/vars")
+        self.__copy(files, ["valid_playbook_vars.yml"], "playbooks")
+
+        parser = AnsibleParser()
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_parser_worker,
+            initargs=(parser,),
+        ) as executor:
+            parser.executor = executor
+            self.__assert_same_project(AnsibleParser(), parser)
+
+    def test_executor_excludes_processes(self) -> None:
+        files = "tests/parser/ansible/files"
+        for i in range(2):
+            self.__copy(files, ["become.yml"], f"roles/r{i}/tasks")
+            self.__copy(files, ["become.yml"], f"roles/r{i}/vendor/tasks")
+
+        def get_parser() -> AnsibleParser:
+            parser = AnsibleParser()
+            parser.excludes = Excludes(["vendor/"], self.tmp.name)
+            return parser
+
+        parser = get_parser()
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_parser_worker,
+            initargs=(parser,),
+        ) as executor:
+            parser.executor = executor
+            self.__assert_same_project(get_parser(), parser)
+            project = parser.parse(self.tmp.name, UnitBlockType.unknown, False)
+
+        assert isinstance(project, Project)
+        self.assertEqual(len(project.modules), 2)
+        for module in project.modules:
+            self.assertEqual(
+                [b.path for b in module.blocks],
+                [os.path.join(module.path, "tasks", "0_become.yml")],
+            )
@@ -0,0 +1,75 @@
+import os
+import pickle
+import unittest
+
+from unittest import mock
+from tempfile import TemporaryDirectory
+from glitch.repr import source
+from glitch.repr.source import Source
+from glitch.repr.inter import UnitBlock, UnitBlockType
+
+
+class TestSource(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "a.pp")
+        with open(self.path, "wb") as f:
+            f.write(b"line 1\r\nline 2\rline 3\n\nline 5")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_source_lines(self) -> None:
+        with open(self.path) as f:
+            lines = f.readlines()
+        s = Source(self.path)
+        self.assertEqual(s.lines, lines)
+        self.assertEqual(s.text, "".join(lines))
+        self.assertEqual(s.line(2), "line 2\n")
+        with s.open() as f:
+            self.assertEqual(f.name, self.path)
+            self.assertEqual(f.readlines(), lines)
+
+    def test_source_count_lines(self) -> None:
+        # The line endings in the file are not only newlines
+        self.assertEqual(Source(self.path).count_lines(), 5)
+        with open(self.path, "wb") as f:
+            f.write(b"line 1\nline 2\n\nline 4")
+        with mock.patch.object(source, "COUNT_CHUNK_SIZE", 4):
+            self.assertEqual(Source(self.path).count_lines(), 4)
+
+    def test_source_single_copy(self) -> None:
+        with open(self.path) as f:
+            text = f.read()
+        s = Source(self.path)
+        self.assertEqual(s.size, 29)
+        self.assertIsNotNone(getattr(s, "_Source__data"))
+        self.assertEqual(s.text, text)
+        self.assertIsNone(getattr(s, "_Source__data"))
+        self.assertEqual(len(s.lines), 5)
+        self.assertIsNone(getattr(s, "_Source__text"))
+        self.assertEqual(s.text, text)
+        self.assertEqual(s.size, 29)
+        with s.open() as f:
+            self.assertEqual(f.read(), text)
+
+    def test_source_pickle(self) -> None:
+        s = Source(self.path)
+        self.assertEqual(len(s.lines), 5)
+        data = pickle.dumps(s)
+        self.assertNotIn(b"line 2", data)
+        self.assertEqual(pickle.loads(data).lines, s.lines)
+
+    def test_source_invalid_encoding(self) -> None:
+        with open(self.path, "wb") as f:
+            f.write(b"\xff\xfe\xfa")
+        s = Source(self.path)
+        self.assertEqual(s.size, 3)
+        with self.assertRaises(UnicodeDecodeError):
+            s.lines
+
+    def test_source_missing_file(self) -> None:
+        unit_block = UnitBlock("a.pp", UnitBlockType.script)
+        unit_block.path = self.path
+        os.remove(self.path)
+        self.assertNotIn("lines", unit_block.as_dict())
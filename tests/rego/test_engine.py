@@ -0,0 +1,35 @@
+import re
+import unittest
+
+from glitch.helpers import ini_to_json_dict
+from glitch.rego.engine import keyword_patterns
+
+
+class TestKeywordPatterns(unittest.TestCase):
+    def test_keyword_patterns(self) -> None:
+        config = ini_to_json_dict("glitch/configs/default.ini")
+        patterns = keyword_patterns(config)
+        self.assertEqual(patterns["checksum"], "(?:gpg|checksum)")
+        # Roles are empty in the default config
+        self.assertEqual(config["security"]["roles"], [])
+        self.assertIsNone(re.search(patterns["roles"], "admin"))
+        self.assertNotIn("ip_binding_commands", patterns)
+
+        # The combined pattern matches the same names as the keywords
+        pattern = "[_A-Za-z0-9$/\\.\\[\\]-]*%s\\b"
+        for name in ["db_password", "pass", "passwd_file", "user", "tokenizer"]:
+            expected = any(
+                re.search(pattern % keyword, name)
+                for keyword in config["security"]["passwords"]
+            )
+            self.assertEqual(
+                re.search(pattern % patterns["passwords"], name) is not None,
+                expected,
+            )
+
+    def test_keyword_patterns_missing(self) -> None:
+        self.assertEqual(keyword_patterns({}), {})
+        self.assertEqual(
+            keyword_patterns({"security": {"passwords": "pass"}}),
+            {},
+        )
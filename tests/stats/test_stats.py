@@ -0,0 +1,114 @@
+import io
+import os
+import unittest
+import contextlib
+
+from glitch.tech import Tech
+from glitch.analysis.rules import Error
+from glitch.stats.stats import FileStats, SmellStats
+from glitch.stats.print import print_stats
+from glitch.repr.inter import UnitBlockType
+from glitch.runner import get_parser, parse_and_check
+
+
+class TestSmellStats(unittest.TestCase):
+    def test_smell_stats(self) -> None:
+        stats = SmellStats(["sec_hard_pass", "sec_hard_user", "sec_https"])
+        stats.add(
+            [
+                Error.from_record(("sec_hard_pass", "a.pp", 1, "", None, -1, -1, -1)),
+                Error.from_record(("sec_hard_pass", "a.pp", 2, "", None, -1, -1, -1)),
+                Error.from_record(("sec_hard_user", "a.pp", 2, "", None, -1, -1, -1)),
+            ]
+        )
+        stats.add(
+            [Error.from_record(("sec_hard_pass", "b.pp", 1, "", None, -1, -1, -1))]
+        )
+        stats.add([])
+
+        self.assertEqual(
+            stats.occurrences,
+            {"sec_hard_pass": 3, "sec_hard_user": 1, "sec_https": 0},
+        )
+        self.assertEqual(
+            stats.files, {"sec_hard_pass": 2, "sec_hard_user": 1, "sec_https": 0}
+        )
+        self.assertEqual(stats.combined_files, 2)
+
+        # The errors of a file may be added in several calls
+        stats.add(
+            [Error.from_record(("sec_hard_pass", "a.pp", 5, "", None, -1, -1, -1))]
+        )
+        stats.add([Error.from_record(("sec_https", "a.pp", 6, "", None, -1, -1, -1))])
+        self.assertEqual(
+            stats.files, {"sec_hard_pass": 2, "sec_hard_user": 1, "sec_https": 1}
+        )
+        self.assertEqual(stats.combined_files, 2)
+
+
+class TestFileStats(unittest.TestCase):
+    def test_file_stats(self) -> None:
+        paths = [
+            "tests/parser/puppet/files/values.pp",
+            "tests/parser/puppet/files/edge_case.pp",
+        ]
+        total = FileStats()
+        for path in paths:
+            stats = FileStats()
+            errors, _ = parse_and_check(
+                UnitBlockType.script,
+                path,
+                False,
+                get_parser(Tech.puppet),
+                [],
+                stats,
+                None,
+                True,
+            )
+            assert errors is not None
+            with open(path, "rb") as f:
+                content = f.read()
+            self.assertEqual(stats.files, {path})
+            self.assertEqual(stats.loc, len(content.decode().splitlines()))
+            self.assertEqual(stats.bytes, len(content))
+            self.assertGreater(stats.parse_time, 0)
+            self.assertGreater(stats.analysis_time, 0)
+            total.merge(stats)
+
+        self.assertEqual(total.files, set(paths))
+        self.assertEqual(total.bytes, sum(os.path.getsize(p) for p in paths))
+
+
+class TestPrintStats(unittest.TestCase):
+    def test_print_stats_latex(self) -> None:
+        smell_stats = SmellStats(["sec_hard_pass", "sec_https"])
+        smell_stats.add(
+            [
+                Error.from_record(("sec_hard_pass", "a.pp", i, "", None, -1, -1, -1))
+                for i in range(1500)
+            ]
+        )
+        file_stats = FileStats()
+        file_stats.files = {"a.pp", "b.pp", "c.pp"}
+        file_stats.loc = 1234
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            print_stats(smell_stats, file_stats, "latex")
+        # Same output as the Styler.to_latex of pandas, used before
+        self.assertEqual(
+            output.getvalue(),
+            "\\begin{tabular}{lrrr}\n"
+            "\\textbf{Smell} & \\textbf{Occurrences} & "
+            "\\textbf{Smell density (Smell/KLoC)} & "
+            "\\textbf{Proportion of scripts (%)} \\\\\n"
+            "Hard-coded password & 1,500 & 1,215.56 & 33.33 \\\\\n"
+            "Use of HTTP without TLS & 0 & 0.00 & 0.00 \\\\\n"
+            "\\midrule\n"
+            "Combined & 1,500 & 1,215.56 & 33.33 \\\\\n"
+            "\\end{tabular}\n\n"
+            "\\begin{tabular}{rr}\n"
+            "\\textbf{Total IaC files} & \\textbf{Lines of Code} \\\\\n"
+            "3 & 1,234 \\\\\n"
+            "\\end{tabular}\n\n",
+        )
@@ -0,0 +1,55 @@
+import json
+import unittest
+
+from io import StringIO
+from glitch.analysis.rules import Error
+from glitch.writers import JsonLinesWriter, SarifWriter
+
+
+class TestWriters(unittest.TestCase):
+    def setUp(self) -> None:
+        self.error = Error.from_record(
+            ("sec_hard_pass", "a.pp", 3, "$pass = 'a,b'", "x, y", 5, 3, 18)
+        )
+        self.undefined = Error.from_record(
+            ("sec_hard_user", "b.pp", -1, "", None, -1, -1, -1)
+        )
+
+    def test_writers_jsonl(self) -> None:
+        f = StringIO()
+        writer = JsonLinesWriter(f)
+        writer.begin()
+        writer.write([self.error, self.undefined])
+        writer.end()
+        records = [json.loads(line) for line in f.getvalue().splitlines()]
+        self.assertEqual(records[0]["opt_msg"], "x, y")
+        self.assertEqual(records[0]["repr"], "$pass = 'a,b'")
+        self.assertEqual(
+            [records[0][k] for k in ("line", "column", "end_line", "end_column")],
+            [3, 5, 3, 18],
+        )
+        self.assertIsNone(records[1]["line"])
+        self.assertIsNone(records[1]["column"])
+
+    def test_writers_sarif(self) -> None:
+        for errors in ([], [self.error, self.undefined]):
+            f = StringIO()
+            writer = SarifWriter(f, ["sec_hard_user", "sec_hard_pass"])
+            writer.begin()
+            writer.write(errors)
+            writer.end()
+            run = json.loads(f.getvalue())["runs"][0]
+            self.assertEqual(
+                [r["id"] for r in run["tool"]["driver"]["rules"]],
+                ["sec_hard_user", "sec_hard_pass"],
+            )
+            self.assertEqual(len(run["results"]), len(errors))
+
+        self.assertEqual(run["results"][0]["ruleIndex"], 1)
+        self.assertEqual(
+            run["results"][0]["locations"][0]["physicalLocation"]["region"],
+            {"startLine": 3, "startColumn": 5, "endLine": 3, "endColumn": 18},
+        )
+        self.assertNotIn(
+            "region", run["results"][1]["locations"][0]["physicalLocation"]
+        )